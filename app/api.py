@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Optional, Set
+
+from fastapi import APIRouter, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from nicegui import app
+
+from app.database import get_session
+from app.game_service import load_game_session
+from app.models import GameStatsList, ScoreEventOutList
+from app.session_store import STATE_MESSAGE, SessionStore, get_session_store, subscribe_updates
+from app.stats_service import leaderboard, score_event_history
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to spectators of a game that does not exist
+UNKNOWN_GAME_CLOSE_CODE = 4404
+MAX_LEADERBOARD_LIMIT = 100
+
+router = APIRouter()
+
+
+def _base_state(game_id: int) -> Optional[bytes]:
+    """Full live session a spectator applies the following deltas to (Redis first, then SQL)"""
+    with get_session() as session:
+        game_session = load_game_session(session, get_session_store(), game_id)
+    if game_session is None:
+        return None
+    return SessionStore.message(STATE_MESSAGE, game_session.model_dump())
+
+
+async def _relay(websocket: WebSocket, updates: AsyncIterator[bytes]) -> None:
+    async for update in updates:
+        await websocket.send_bytes(update)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Spectators send nothing; reading is what notices a disconnect while no delta is being published
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        continue
+
+
+@router.get("/api/leaderboard")
+def get_leaderboard(limit: int = Query(10, ge=1, le=MAX_LEADERBOARD_LIMIT)) -> Response:
+    with get_session() as session:
+        stats = leaderboard(session, limit)
+    return Response(GameStatsList.dump_json(stats), media_type="application/json")
+
+
+@router.get("/api/games/{game_id}/score-events")
+def get_score_events(game_id: int) -> Response:
+    with get_session() as session:
+        events = score_event_history(session, game_id)
+    return Response(ScoreEventOutList.dump_json(events), media_type="application/json")
+
+
+@router.websocket("/ws/games/{game_id}")
+async def game_updates(websocket: WebSocket, game_id: int) -> None:
+    # Subscribe before loading the base state so no delta published in between is missed;
+    # deltas carry absolute values, so one already included in the base state is harmless
+    await websocket.accept()
+    async with subscribe_updates(game_id) as updates:
+        base_state = await run_in_threadpool(_base_state, game_id)
+        if base_state is None:
+            await websocket.close(code=UNKNOWN_GAME_CLOSE_CODE)
+            return
+        tasks: Set[asyncio.Task] = set()
+        try:
+            await websocket.send_bytes(base_state)
+            tasks = {
+                asyncio.create_task(_relay(websocket, updates)),
+                asyncio.create_task(_wait_for_disconnect(websocket)),
+            }
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        except WebSocketDisconnect:
+            logger.info("Spectator of game %s disconnected", game_id)
+        finally:
+            # Leaving the subscription context afterwards closes its Redis connection, dropping the subscription
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+
+def create() -> None:
+    app.include_router(router)
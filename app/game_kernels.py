@@ -0,0 +1,119 @@
+"""Per-tick numeric kernels over the precomputed maze tables.
+
+Ghosts are handled as structure-of-arrays (positions, directions and targets as NumPy arrays) moving
+through the neighbor table from ``app.maze_grid``, and pellets as the uint8 view of a bitmap from
+``app.pellets``. The kernels are compiled eagerly by Numba
+when it is installed (``jit`` extra); without it the same functions run as plain Python.
+"""
+
+import logging
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models import Direction, GhostState
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, types  # pyright: ignore[reportMissingImports]
+
+    HAS_NUMBA = True
+    # Neighbor tables are read-only views over Maze.neighbor_table, which string signatures cannot express
+    STEP_GHOSTS_SIGNATURE = types.void(
+        types.int16[:, :],
+        types.int8[:],
+        types.int16[:, :],
+        types.Array(types.int32, 2, "A", readonly=True),
+        types.int64,
+    )
+except ImportError:
+    logger.info("numba is not installed (jit extra); game kernels run as plain Python")
+    HAS_NUMBA = False
+    STEP_GHOSTS_SIGNATURE = None
+
+    def njit(*args, **kwargs):
+        """Stand-in for ``numba.njit`` that leaves the function uncompiled"""
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Direction codes used by the kernels (neighbor table columns, index into OPPOSITE); plain ints so Numba freezes them
+DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT, DIR_NONE = (int(direction) for direction in Direction)
+
+OPPOSITE = np.array([DIR_DOWN, DIR_UP, DIR_RIGHT, DIR_LEFT, DIR_NONE], dtype=np.int8)
+# Arcade tie-break order when two exits are equally close to the target
+TURN_PRIORITY = np.array([DIR_UP, DIR_LEFT, DIR_DOWN, DIR_RIGHT], dtype=np.int8)
+
+
+@njit(STEP_GHOSTS_SIGNATURE, cache=True)
+def step_ghosts(pos_xy, dir_, targets, nbrs, width):
+    """Advance every ghost one cell towards its target, in place.
+
+    A ghost never reverses unless it is in a dead end; among the open exits it takes the one closest
+    (squared distance) to its target cell. ``nbrs`` is the maze's neighbor table, so each candidate move
+    is one lookup with no wall or bounds checks.
+    """
+    for i in range(pos_xy.shape[0]):
+        cell = np.int64(pos_xy[i, 1]) * width + pos_xy[i, 0]
+        current = dir_[i]
+        best = DIR_NONE
+        best_cell = np.int64(-1)
+        best_dist = np.int64(-1)
+        for k in range(TURN_PRIORITY.shape[0]):
+            d = TURN_PRIORITY[k]
+            if current != DIR_NONE and d == OPPOSITE[current]:
+                continue
+            next_cell = np.int64(nbrs[cell, d])
+            if next_cell < 0:
+                continue
+            dist = (next_cell % width - targets[i, 0]) ** 2 + (next_cell // width - targets[i, 1]) ** 2
+            if best_dist < 0 or dist < best_dist:
+                best = d
+                best_cell = next_cell
+                best_dist = dist
+        if best == DIR_NONE and current != DIR_NONE:
+            back = OPPOSITE[current]
+            if nbrs[cell, back] >= 0:
+                best = back
+                best_cell = np.int64(nbrs[cell, back])
+        if best_cell >= 0:
+            pos_xy[i, 0] = best_cell % width
+            pos_xy[i, 1] = best_cell // width
+        dir_[i] = best
+
+
+@njit("int64(int16[:], uint8[:], int64)", cache=True)
+def eat_pellets(pacman_xy, bitmap, w):
+    """Clear the bitmap bit under Pac-Man; returns 1 if a pellet was eaten, else 0"""
+    i = np.int64(pacman_xy[1]) * w + pacman_xy[0]
+    byte = i >> 3
+    mask = np.uint8(1 << (i & 7))
+    if bitmap[byte] & mask:
+        bitmap[byte] = bitmap[byte] & ~mask
+        return 1
+    return 0
+
+
+def ghost_arrays(ghosts: Sequence[GhostState]) -> Tuple[NDArray[np.int16], NDArray[np.int8], NDArray[np.int16]]:
+    """Pack ghost state into ``(pos_xy, dir_, targets)`` arrays for ``step_ghosts``.
+
+    Fractional positions and targets are rounded to the nearest cell, which is also where
+    ``apply_ghost_arrays`` puts the ghosts back.
+    """
+    pos_xy = np.rint([(ghost.x, ghost.y) for ghost in ghosts]).astype(np.int16).reshape(-1, 2)
+    dir_ = np.array([ghost.direction for ghost in ghosts], dtype=np.int8)
+    targets = np.rint([(ghost.target_x, ghost.target_y) for ghost in ghosts]).astype(np.int16).reshape(-1, 2)
+    return pos_xy, dir_, targets
+
+
+def apply_ghost_arrays(ghosts: Sequence[GhostState], pos_xy: NDArray[np.int16], dir_: NDArray[np.int8]) -> None:
+    """Write kernel results back onto the ghost state"""
+    for i, ghost in enumerate(ghosts):
+        ghost.x = float(pos_xy[i, 0])
+        ghost.y = float(pos_xy[i, 1])
+        ghost.direction = Direction(int(dir_[i]))
@@ -0,0 +1,308 @@
+"""Game session persistence.
+
+The authoritative live session (``GameSession``) is kept in Redis via ``SessionStore`` and written on
+every tick; SQL only receives it when the game stops ticking (paused, level complete, game over), so a
+session whose Redis key expired resumes from SQL. Per-frame Pac-Man and ghost
+state is held in slotted ``PacmanState``/``GhostState`` dataclasses and travels as a single JSON snapshot
+(``live_state``); the normalized ``PacMan``/``Ghost`` rows are only synchronized at level boundaries.
+Score events are buffered as plain dicts and bulk-inserted. After every tick only the changed parts
+of the session (``state_delta``) are published to spectators over Redis pub/sub.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, col, desc, insert, select, update
+
+from app.maze_grid import build_maze
+from app.models import (
+    CellType,
+    Game,
+    GameCreate,
+    GameSession,
+    GameState,
+    GameStatus,
+    Ghost,
+    GhostState,
+    GhostType,
+    Maze,
+    PacMan,
+    PacmanState,
+    ScoreEvent,
+)
+from app.session_store import DELTA_MESSAGE, STATE_MESSAGE, SessionStore
+
+# Statuses at which a live session is flushed from Redis to SQL, once on the tick that enters them
+FLUSH_STATUSES = {GameStatus.PAUSED, GameStatus.GAME_OVER, GameStatus.LEVEL_COMPLETE}
+
+# Eager-load every per-game relationship with one extra ``WHERE game_id IN (...)`` query each
+GAME_LOAD_OPTIONS = (
+    selectinload(Game.pacman),  # type: ignore[arg-type]
+    selectinload(Game.ghosts),  # type: ignore[arg-type]
+    selectinload(Game.maze),  # type: ignore[arg-type]
+)
+
+# Buffered score events are written once this many have accumulated
+SCORE_EVENT_FLUSH_SIZE = 100
+
+
+def get_game(session: Session, game_id: int) -> Optional[Game]:
+    """Load a game together with its Pac-Man, ghosts and maze"""
+    return session.exec(select(Game).where(col(Game.id) == game_id).options(*GAME_LOAD_OPTIONS)).first()
+
+
+def list_games(session: Session, offset: int = 0, limit: int = 20) -> List[Game]:
+    """Page through games, newest first, with relationships loaded in a fixed number of queries"""
+    statement = select(Game).order_by(desc(Game.created_at)).offset(offset).limit(limit).options(*GAME_LOAD_OPTIONS)
+    return list(session.exec(statement).all())
+
+
+def create_game(
+    session: Session,
+    data: GameCreate,
+    cells: Sequence[Sequence[CellType]],
+    pacman_spawn: Tuple[int, int],
+    ghost_spawn: Tuple[int, int],
+    tunnels: Optional[Sequence[Tuple[int, int, int, int]]] = None,
+) -> Tuple[GameSession, PacmanState, List[GhostState]]:
+    """Set up a new game: its row, maze, Pac-Man and one ghost of each type.
+
+    Rows are written with ``INSERT ... RETURNING id`` (one statement for all ghosts) rather than
+    add/flush/refresh, so surrogate keys come back without a follow-up SELECT. Values are taken from
+    validated model instances so Python-side defaults apply. ``cells`` must match the requested
+    ``maze_width`` x ``maze_height``.
+    """
+    width, height = (len(cells[0]) if cells else 0), len(cells)
+    if (width, height) != (data.maze_width, data.maze_height):
+        raise ValueError(f"Maze cells are {width}x{height}, expected {data.maze_width}x{data.maze_height}")
+
+    # The game id is only known after the INSERT; live_state leaves game_id out, so 0 never reaches it
+    pacman = PacmanState(game_id=0, x=float(pacman_spawn[0]), y=float(pacman_spawn[1]))
+    ghosts = {
+        ghost_type: GhostState(game_id=0, ghost_type=ghost_type, x=float(ghost_spawn[0]), y=float(ghost_spawn[1]))
+        for ghost_type in GhostType
+    }
+    game = Game(
+        player_name=data.player_name,
+        status=GameStatus.PLAYING,
+        live_state=snapshot_live_state(pacman, list(ghosts.values())),
+    )
+    statement = insert(Game).values(**game.model_dump(exclude={"id"})).returning(col(Game.id))
+    game_id = session.exec(statement).scalar_one()  # type: ignore[call-overload]
+
+    maze = build_maze(game_id, cells, pacman_spawn, ghost_spawn, tunnels)
+    session.exec(insert(Maze).values(**maze.model_dump(exclude={"id"})))  # type: ignore[call-overload]
+
+    pacman.game_id = game_id
+    statement = insert(PacMan).values(**pacman.to_model().model_dump(exclude={"id"})).returning(col(PacMan.id))
+    pacman.id = session.exec(statement).scalar_one()  # type: ignore[call-overload]
+
+    for ghost in ghosts.values():
+        ghost.game_id = game_id
+    # Multi-row RETURNING makes no ordering promise, so ids are matched back by ghost type
+    ghost_statement = (
+        insert(Ghost)
+        .values([ghost.to_model().model_dump(exclude={"id"}) for ghost in ghosts.values()])
+        .returning(col(Ghost.id), col(Ghost.ghost_type))
+    )
+    for ghost_id, ghost_type in session.exec(ghost_statement):  # type: ignore[call-overload]
+        ghosts[ghost_type].id = ghost_id
+    session.commit()
+
+    game_session = GameSession(
+        game_id=game_id,
+        status=game.status,
+        current_level=game.current_level,
+        score=int(game.score),
+        lives=game.lives,
+        live_state=snapshot_live_state(pacman, list(ghosts.values())),
+    )
+    return game_session, pacman, list(ghosts.values())
+
+
+def _snapshot_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+    del data["game_id"]
+    return data
+
+
+def snapshot_live_state(pacman: Optional[PacmanState], ghosts: Sequence[GhostState]) -> Dict[str, Any]:
+    """Build the ``Game.live_state`` payload from in-memory tick state; entries leave out the session's game_id"""
+    return {
+        "pacman": _snapshot_entry(pacman.as_dict()) if pacman is not None else None,
+        "ghosts": [_snapshot_entry(ghost.as_dict()) for ghost in ghosts],
+    }
+
+
+def restore_live_state(game_id: int, live_state: Dict[str, Any]) -> Tuple[Optional[PacmanState], List[GhostState]]:
+    """Rebuild the tick state of a game from its ``Game.live_state`` payload"""
+    pacman_data = live_state.get("pacman")
+    pacman = PacmanState.from_dict({**pacman_data, "game_id": game_id}) if pacman_data is not None else None
+    ghosts = [GhostState.from_dict({**ghost_data, "game_id": game_id}) for ghost_data in live_state.get("ghosts", [])]
+    return pacman, ghosts
+
+
+class ScoreEventBuffer:
+    """Score events of one game session, kept as mappings and written with a single bulk INSERT"""
+
+    def __init__(self, flush_size: int = SCORE_EVENT_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self.events: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, game_id: int, event_type: str, points: int, x: float, y: float) -> None:
+        self.events.append(
+            {
+                "game_id": game_id,
+                "event_type": event_type,
+                "points": points,
+                "x": x,
+                "y": y,
+                "created_at": datetime.utcnow(),
+            }
+        )
+
+    def is_full(self) -> bool:
+        return len(self.events) >= self.flush_size
+
+    def flush(self, session: Session) -> int:
+        """Add the buffered events to the session's transaction; returns how many were written"""
+        count = len(self.events)
+        if count == 0:
+            return 0
+        session.bulk_insert_mappings(ScoreEvent, self.events)  # type: ignore[arg-type]
+        self.events.clear()
+        return count
+
+
+def state_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Parts of a ``GameSession`` payload that changed since the previous tick.
+
+    Session fields are included when they differ, ``pacman`` when it changed at all, and ``ghosts`` as
+    a ``{position: ghost}`` map of the changed ones only. Without a previous payload the full state is
+    returned.
+    """
+    if previous is None:
+        return current
+
+    delta: Dict[str, Any] = {"game_id": current["game_id"]}
+    for field, value in current.items():
+        if field != "live_state" and previous.get(field) != value:
+            delta[field] = value
+
+    previous_live, live = previous.get("live_state", {}), current.get("live_state", {})
+    if previous_live.get("pacman") != live.get("pacman"):
+        delta["pacman"] = live.get("pacman")
+    previous_ghosts = previous_live.get("ghosts", [])
+    changed_ghosts = {
+        i: ghost
+        for i, ghost in enumerate(live.get("ghosts", []))
+        if i >= len(previous_ghosts) or previous_ghosts[i] != ghost
+    }
+    if changed_ghosts:
+        delta["ghosts"] = changed_ghosts
+    return delta
+
+
+def save_tick(
+    session: Session,
+    store: SessionStore,
+    game_session: GameSession,
+    pacman: Optional[PacmanState],
+    ghosts: Sequence[GhostState],
+    score_events: Optional[ScoreEventBuffer] = None,
+    previous_state: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Persist one game tick: always to Redis, to SQL only on the tick that enters a ``FLUSH_STATUSES`` status.
+
+    Without a ``previous_state`` the current status counts as entered; entering LEVEL_COMPLETE also
+    syncs the PacMan/Ghost rows. Buffered score events are written when the buffer fills up or with that
+    flush. The delta against ``previous_state`` (the full state without one) is published to subscribers;
+    the returned payload is what to pass as ``previous_state`` on the next tick.
+    """
+    game_session.live_state = snapshot_live_state(pacman, ghosts)
+    current_state = store.save(game_session)
+    if previous_state is None:
+        store.publish(game_session.game_id, STATE_MESSAGE, current_state)
+    elif len(delta := state_delta(previous_state, current_state)) > 1:
+        store.publish(game_session.game_id, DELTA_MESSAGE, delta)
+    status_changed = previous_state is None or previous_state["status"] != current_state["status"]
+    if game_session.status in FLUSH_STATUSES and status_changed:
+        if game_session.status == GameStatus.LEVEL_COMPLETE:
+            persist_entities(session, game_session.game_id, pacman, ghosts)
+        flush_game_session(session, game_session, score_events)
+    elif score_events is not None and score_events.is_full():
+        score_events.flush(session)
+        session.commit()
+    return current_state
+
+
+def flush_game_session(
+    session: Session, game_session: GameSession, score_events: Optional[ScoreEventBuffer] = None
+) -> None:
+    """Commit a live session to SQL with a single games UPDATE plus a GameState snapshot"""
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {
+        "status": game_session.status,
+        "score": Decimal(game_session.score),
+        "lives": game_session.lives,
+        "current_level": game_session.current_level,
+        "live_state": game_session.live_state,
+        "updated_at": now,
+    }
+    if game_session.status == GameStatus.GAME_OVER:
+        values["completed_at"] = now
+
+    session.exec(update(Game).where(col(Game.id) == game_session.game_id).values(**values))  # type: ignore[call-overload]
+    session.add(GameState(game_id=game_session.game_id, state_data=game_session.model_dump()))
+    if score_events is not None:
+        score_events.flush(session)
+    session.commit()
+
+
+def load_game_session(session: Session, store: SessionStore, game_id: int) -> Optional[GameSession]:
+    """Fetch the live session for a (re)connecting client, falling back to the last state committed to SQL"""
+    game_session = store.load(game_id)
+    if game_session is not None:
+        return game_session
+
+    game = session.get(Game, game_id)
+    if game is None:
+        return None
+
+    game_session = GameSession(
+        game_id=game_id,
+        status=game.status,
+        current_level=game.current_level,
+        score=int(game.score),
+        lives=game.lives,
+        live_state=game.live_state or {},
+    )
+    store.save(game_session)
+    return game_session
+
+
+def persist_entities(
+    session: Session, game_id: int, pacman: Optional[PacmanState], ghosts: Sequence[GhostState]
+) -> None:
+    """Write tick state into the game's normalized PacMan/Ghost rows; the caller commits.
+
+    Rows are matched by game (and ghost type) rather than id, so state restored from a snapshot
+    without ids still lands on the rows ``create_game`` inserted.
+    """
+    now = datetime.utcnow()
+    if pacman is not None:
+        values = pacman.to_model().model_dump(exclude={"id", "game_id", "last_updated"})
+        statement = update(PacMan).where(col(PacMan.game_id) == game_id).values(**values, last_updated=now)
+        session.exec(statement)  # type: ignore[call-overload]
+    for ghost in ghosts:
+        values = ghost.to_model().model_dump(exclude={"id", "game_id", "ghost_type", "last_updated"})
+        statement = (
+            update(Ghost)
+            .where(col(Ghost.game_id) == game_id, col(Ghost.ghost_type) == ghost.ghost_type)
+            .values(**values, last_updated=now)
+        )
+        session.exec(statement)  # type: ignore[call-overload]
@@ -0,0 +1,164 @@
+"""Packed maze grid encoding.
+
+The maze grid is stored as one byte per cell in ``Maze.layout_packed`` (row-major) and decoded into a
+NumPy ``uint8`` array of shape ``(height, width)``, so collision and pellet lookups are ``grid[y, x]``.
+Tunnels are ``(N, 4)`` ``int16`` arrays of ``[ax, ay, bx, by]`` rows, checked with one vectorized compare.
+
+Since a maze never changes within a level, cell adjacency is also precomputed once into
+``Maze.neighbor_table``: an ``int32`` array of shape ``(height * width, 4)`` whose row ``y * width + x``
+holds the index of the open neighbor in each direction (columns ordered by ``Direction`` value), or -1
+for a wall. Tunnel ends sit on the maze edge, and their off-grid direction points at the other end, so
+movement, tunnel wraps included, is a single gather ``nbrs[cell, direction]``.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.models import CellType, Direction, Maze
+from app.pellets import new_bitmap, pellet_set, remaining_pellets
+
+# CellType values are the byte codes
+WALL = int(CellType.WALL)
+# One int32 neighbor per direction
+NEIGHBOR_ROW_BYTES = 4 * np.dtype(np.int32).itemsize
+
+
+def pack_layout(cells: Sequence[Sequence[CellType]]) -> bytes:
+    """Encode a row-major grid of cell types as one byte per cell"""
+    if not cells:
+        raise ValueError("Maze layout must have at least one row")
+    width = len(cells[0])
+    if any(len(row) != width for row in cells):
+        raise ValueError("All maze rows must have the same width")
+    return bytes(cell for row in cells for cell in row)
+
+
+def unpack_layout(blob: bytes, width: int, height: int) -> NDArray[np.uint8]:
+    """Decode a packed layout into a read-only ``(height, width)`` view over the blob"""
+    if len(blob) != width * height:
+        raise ValueError(f"Packed layout has {len(blob)} cells, expected {width}x{height}")
+    return np.frombuffer(blob, dtype=np.uint8).reshape(height, width)
+
+
+def maze_grid(maze: Maze) -> NDArray[np.uint8]:
+    return unpack_layout(maze.layout_packed, maze.width, maze.height)
+
+
+def cell_at(grid: NDArray[np.uint8], x: int, y: int) -> CellType:
+    return CellType(int(grid[y, x]))
+
+
+def is_wall(grid: NDArray[np.uint8], x: int, y: int) -> bool:
+    return grid[y, x] == WALL
+
+
+def edge_direction(x: int, y: int, width: int, height: int) -> Direction:
+    """Direction that leads off the grid from a tunnel end on the maze edge"""
+    match (x, y):
+        case (0, _):
+            return Direction.LEFT
+        case _ if x == width - 1:
+            return Direction.RIGHT
+        case (_, 0):
+            return Direction.UP
+        case _ if y == height - 1:
+            return Direction.DOWN
+        case _:
+            raise ValueError(f"Tunnel end ({x}, {y}) is not on the maze edge")
+
+
+def build_neighbor_table(grid: NDArray[np.uint8], tunnels: Optional[NDArray[np.int16]] = None) -> NDArray[np.int32]:
+    """Open-neighbor cell index per cell and direction, -1 for walls, edges and wall cells themselves.
+
+    Each tunnel ``[ax, ay, bx, by]`` links the off-grid direction of one end to the other end.
+    """
+    height, width = grid.shape
+    is_open = grid != WALL
+    index = np.arange(height * width, dtype=np.int32).reshape(height, width)
+    nbrs = np.full((height, width, 4), -1, dtype=np.int32)
+    nbrs[1:, :, Direction.UP] = np.where(is_open[:-1, :], index[:-1, :], -1)
+    nbrs[:-1, :, Direction.DOWN] = np.where(is_open[1:, :], index[1:, :], -1)
+    nbrs[:, 1:, Direction.LEFT] = np.where(is_open[:, :-1], index[:, :-1], -1)
+    nbrs[:, :-1, Direction.RIGHT] = np.where(is_open[:, 1:], index[:, 1:], -1)
+    nbrs[~is_open] = -1
+    for ax, ay, bx, by in tunnels.tolist() if tunnels is not None else []:
+        nbrs[ay, ax, edge_direction(ax, ay, width, height)] = index[by, bx]
+        nbrs[by, bx, edge_direction(bx, by, width, height)] = index[ay, ax]
+    return nbrs.reshape(-1, 4)
+
+
+def neighbor_table(maze: Maze) -> NDArray[np.int32]:
+    """Read-only ``(height * width, 4)`` view over ``Maze.neighbor_table``"""
+    if len(maze.neighbor_table) != maze.width * maze.height * NEIGHBOR_ROW_BYTES:
+        raise ValueError(f"Neighbor table has {len(maze.neighbor_table)} bytes, expected {maze.width}x{maze.height}")
+    return np.frombuffer(maze.neighbor_table, dtype=np.int32).reshape(-1, 4)
+
+
+def ensure_neighbor_table(maze: Maze) -> None:
+    """Build the neighbor table of mazes saved before it existed from their packed layout and tunnels"""
+    if len(maze.neighbor_table) != maze.width * maze.height * NEIGHBOR_ROW_BYTES:
+        maze.neighbor_table = build_neighbor_table(maze_grid(maze), tunnel_array(maze)).tobytes()
+
+
+def tunnel_array(maze: Maze) -> NDArray[np.int16]:
+    """Tunnel pairs of a maze as an ``(N, 4)`` array of ``[ax, ay, bx, by]`` rows"""
+    return np.array(maze.tunnel_pairs, dtype=np.int16).reshape(-1, 4)
+
+
+def tunnel_exit(tunnels: NDArray[np.int16], x: int, y: int) -> Optional[Tuple[int, int]]:
+    """Cell a tunnel entrance at ``(x, y)`` leads to, or None if ``(x, y)`` is not a tunnel end"""
+    (a_hits,) = np.where((tunnels[:, 0] == x) & (tunnels[:, 1] == y))
+    if a_hits.size:
+        row = tunnels[a_hits[0]]
+        return int(row[2]), int(row[3])
+    (b_hits,) = np.where((tunnels[:, 2] == x) & (tunnels[:, 3] == y))
+    if b_hits.size:
+        row = tunnels[b_hits[0]]
+        return int(row[0]), int(row[1])
+    return None
+
+
+def build_maze(
+    game_id: int,
+    cells: Sequence[Sequence[CellType]],
+    pacman_spawn: Tuple[int, int],
+    ghost_spawn: Tuple[int, int],
+    tunnels: Optional[Sequence[Tuple[int, int, int, int]]] = None,
+) -> Maze:
+    """Create a Maze row for a game from a grid of cell types; spawns are ``(x, y)`` cells and tunnels
+    ``(ax, ay, bx, by)`` pairs of linked cells"""
+    layout_packed = pack_layout(cells)
+    width, height = len(cells[0]), len(cells)
+    pellets = new_bitmap(width, height)
+    power_pellets = new_bitmap(width, height)
+    for y, row in enumerate(cells):
+        for x, cell in enumerate(row):
+            match cell:
+                case CellType.PELLET:
+                    pellet_set(pellets, x, y, width)
+                case CellType.POWER_PELLET:
+                    pellet_set(power_pellets, x, y, width)
+
+    total_pellets = remaining_pellets(pellets, power_pellets)
+    tunnel_pairs = [list(tunnel) for tunnel in tunnels or []]
+    nbrs = build_neighbor_table(
+        unpack_layout(layout_packed, width, height), np.array(tunnel_pairs, dtype=np.int16).reshape(-1, 4)
+    )
+    return Maze(
+        game_id=game_id,
+        width=width,
+        height=height,
+        layout_packed=layout_packed,
+        pellet_bitmap=bytes(pellets),
+        power_pellet_bitmap=bytes(power_pellets),
+        tunnel_pairs=tunnel_pairs,
+        neighbor_table=nbrs.tobytes(),
+        pacman_spawn_x=pacman_spawn[0],
+        pacman_spawn_y=pacman_spawn[1],
+        ghost_spawn_x=ghost_spawn[0],
+        ghost_spawn_y=ghost_spawn[1],
+        total_pellets=total_pellets,
+        remaining_pellets=total_pellets,
+    )
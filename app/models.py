@@ -1,47 +1,152 @@
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+from sqlmodel import SQLModel, Field, Relationship, JSON, Column, LargeBinary, Index, SmallInteger, desc
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from enum import Enum
+from dataclasses import asdict, dataclass
+from enum import IntEnum
 from decimal import Decimal
+import orjson
+from pydantic import GetCoreSchemaHandler, TypeAdapter
+from pydantic_core import CoreSchema, core_schema
 
 
-# Enums for game entities
-class Direction(str, Enum):
-    UP = "up"
-    DOWN = "down"
-    LEFT = "left"
-    RIGHT = "right"
-    NONE = "none"
+# orjson options shared by every JSON column: numpy arrays and enum/int dict keys serialize natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
 
-class GameStatus(str, Enum):
-    WAITING = "waiting"
-    PLAYING = "playing"
-    GAME_OVER = "game_over"
-    LEVEL_COMPLETE = "level_complete"
-    PAUSED = "paused"
+def orjson_dumps(value: Any) -> str:
+    """Serialize a value to a JSON string with orjson"""
+    return orjson.dumps(value, option=ORJSON_OPTIONS).decode()
 
 
-class GhostMode(str, Enum):
-    SCATTER = "scatter"
-    CHASE = "chase"
-    FRIGHTENED = "frightened"
-    EATEN = "eaten"
+class OrjsonJSON(TypeDecorator):
+    """JSON column type that (de)serializes with orjson instead of the stdlib json module"""
 
+    impl = JSON
+    cache_ok = True
 
-class GhostType(str, Enum):
-    BLINKY = "blinky"  # Red ghost - aggressive chaser
-    PINKY = "pinky"  # Pink ghost - ambush
-    INKY = "inky"  # Blue ghost - patrol
-    CLYDE = "clyde"  # Orange ghost - shy
+    def bind_processor(self, dialect):
+        def process(value: Any) -> Optional[str]:
+            if value is None:
+                return None
+            return orjson_dumps(value)
 
+        return process
 
-class CellType(str, Enum):
-    WALL = "wall"
-    EMPTY = "empty"
-    PELLET = "pellet"
-    POWER_PELLET = "power_pellet"
-    GHOST_HOUSE = "ghost_house"
+    def result_processor(self, dialect, coltype):
+        def process(value: Any) -> Any:
+            # Drivers such as psycopg2 decode JSON themselves (see json_deserializer on the engine)
+            if value is None or not isinstance(value, (str, bytes)):
+                return value
+            return orjson.loads(value)
+
+        return process
+
+
+# Enums for game entities. Stored as SMALLINT; clients exchange them by lowercase name.
+class LabeledIntEnum(IntEnum):
+    @property
+    def label(self) -> str:
+        """Lowercase name used by the JSON API, e.g. ``"frightened"``"""
+        return self.name.lower()
+
+    @classmethod
+    def _missing_(cls, value: object):
+        # Accept API labels ("up", "game_over", ...) wherever a member is validated
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> CoreSchema:
+        # Schemas dump members as their label; the SMALLINT columns go through IntEnumType instead
+        schema = handler(source_type)
+        schema["serialization"] = core_schema.plain_serializer_function_ser_schema(
+            lambda member: cls(member).label, return_schema=core_schema.str_schema()
+        )
+        return schema
+
+
+def labeled(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``data`` with enum members replaced by their labels, for payloads sent to clients"""
+    return {key: value.label if isinstance(value, LabeledIntEnum) else value for key, value in data.items()}
+
+
+class Direction(LabeledIntEnum):
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+    NONE = 4
+
+
+# A current/queued direction pair packed into one small int: (next << 4) | current
+DIRECTION_BITS = 4
+DIRECTION_MASK = (1 << DIRECTION_BITS) - 1
+
+
+def pack_directions(current: Direction, next_direction: Direction) -> int:
+    return (next_direction << DIRECTION_BITS) | current
+
+
+class GameStatus(LabeledIntEnum):
+    WAITING = 0
+    PLAYING = 1
+    GAME_OVER = 2
+    LEVEL_COMPLETE = 3
+    PAUSED = 4
+
+
+class GhostMode(LabeledIntEnum):
+    SCATTER = 0
+    CHASE = 1
+    FRIGHTENED = 2
+    EATEN = 3
+
+
+class GhostType(LabeledIntEnum):
+    BLINKY = 0  # Red ghost - aggressive chaser
+    PINKY = 1  # Pink ghost - ambush
+    INKY = 2  # Blue ghost - patrol
+    CLYDE = 3  # Orange ghost - shy
+
+
+class CellType(LabeledIntEnum):
+    # Values double as the byte codes of Maze.layout_packed
+    WALL = 0
+    EMPTY = 1
+    PELLET = 2
+    POWER_PELLET = 3
+    GHOST_HOUSE = 4
+
+
+class IntEnumType(TypeDecorator):
+    """SMALLINT column that loads values back as members of an IntEnum"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[IntEnum]):
+        super().__init__()
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return int(self.enum_class(value))
+
+    def process_result_value(self, value: Any, dialect) -> Optional[IntEnum]:
+        if value is None:
+            return None
+        return self.enum_class(value)
+
+
+class SettingValueType(LabeledIntEnum):
+    INT = 0
+    FLOAT = 1
+    STR = 2
+    BOOL = 3
+    JSON = 4
 
 
 # Persistent models (stored in database)
@@ -49,16 +154,18 @@ class Game(SQLModel, table=True):
     """Main game session tracking"""
 
     __tablename__ = "games"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_games_score_desc", desc("score")),)  # Leaderboard: ORDER BY score DESC LIMIT n
 
     id: Optional[int] = Field(default=None, primary_key=True)
     player_name: str = Field(max_length=100, default="Player")
-    status: GameStatus = Field(default=GameStatus.WAITING)
+    status: GameStatus = Field(default=GameStatus.WAITING, sa_column=Column(IntEnumType(GameStatus), nullable=False))
     current_level: int = Field(default=1, ge=1)
     score: Decimal = Field(default=Decimal("0"), decimal_places=0)
     lives: int = Field(default=3, ge=0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = Field(default=None)
+    live_state: Dict[str, Any] = Field(default={}, sa_column=Column(OrjsonJSON))  # Per-tick PacMan/ghost snapshot
 
     # Relationships
     pacman: Optional["PacMan"] = Relationship(back_populates="game")
@@ -72,12 +179,17 @@ class Maze(SQLModel, table=True):
     __tablename__ = "mazes"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    game_id: int = Field(foreign_key="games.id")
+    game_id: int = Field(foreign_key="games.id", index=True)
     width: int = Field(ge=10)  # Maze width in cells
     height: int = Field(ge=10)  # Maze height in cells
-    layout: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))  # Grid layout as JSON
-    pellet_positions: List[Dict[str, int]] = Field(default=[], sa_column=Column(JSON))  # [{"x": 1, "y": 2}]
-    power_pellet_positions: List[Dict[str, int]] = Field(default=[], sa_column=Column(JSON))
+    layout: Dict[str, Any] = Field(default={}, sa_column=Column(OrjsonJSON))  # Grid layout as JSON
+    layout_packed: bytes = Field(default=b"", sa_column=Column(LargeBinary))  # One byte per cell, row-major
+    pellet_positions: List[Dict[str, int]] = Field(default=[], sa_column=Column(OrjsonJSON))  # [{"x": 1, "y": 2}]
+    power_pellet_positions: List[Dict[str, int]] = Field(default=[], sa_column=Column(OrjsonJSON))
+    pellet_bitmap: bytes = Field(default=b"", sa_column=Column(LargeBinary))  # 1 bit per cell, see app.pellets
+    power_pellet_bitmap: bytes = Field(default=b"", sa_column=Column(LargeBinary))
+    tunnel_pairs: List[List[int]] = Field(default=[], sa_column=Column(OrjsonJSON))  # [[ax, ay, bx, by], ...]
+    neighbor_table: bytes = Field(default=b"", sa_column=Column(LargeBinary))  # int32 (cells, 4), see app.maze_grid
     ghost_spawn_x: int = Field(ge=0)
     ghost_spawn_y: int = Field(ge=0)
     pacman_spawn_x: int = Field(ge=0)
@@ -95,19 +207,37 @@ class PacMan(SQLModel, table=True):
     __tablename__ = "pacmen"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    game_id: int = Field(foreign_key="games.id")
-    x: Decimal = Field(decimal_places=2)  # Position x coordinate
-    y: Decimal = Field(decimal_places=2)  # Position y coordinate
-    direction: Direction = Field(default=Direction.NONE)
-    next_direction: Direction = Field(default=Direction.NONE)  # Queued direction change
-    speed: Decimal = Field(default=Decimal("2.0"), decimal_places=2)
+    game_id: int = Field(foreign_key="games.id", index=True)
+    x: float  # Position x coordinate (cells)
+    y: float  # Position y coordinate (cells)
+    direction_packed: int = Field(  # direction and queued next_direction, see pack_directions
+        default=pack_directions(Direction.NONE, Direction.NONE), sa_column=Column(SmallInteger, nullable=False)
+    )
+    speed: float = Field(default=2.0)
     is_powered: bool = Field(default=False)  # Has eaten power pellet
-    power_time_remaining: Decimal = Field(default=Decimal("0"), decimal_places=2)  # Seconds of power left
+    power_time_remaining: float = Field(default=0.0)  # Seconds of power left
     last_updated: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationships
     game: Game = Relationship(back_populates="pacman")
 
+    @property
+    def direction(self) -> Direction:
+        return Direction(self.direction_packed & DIRECTION_MASK)
+
+    @direction.setter
+    def direction(self, value: Direction) -> None:
+        self.direction_packed = (self.direction_packed & ~DIRECTION_MASK) | value
+
+    @property
+    def next_direction(self) -> Direction:
+        """Queued direction change"""
+        return Direction(self.direction_packed >> DIRECTION_BITS)
+
+    @next_direction.setter
+    def next_direction(self, value: Direction) -> None:
+        self.direction_packed = pack_directions(self.direction, value)
+
 
 class Ghost(SQLModel, table=True):
     """Ghost enemy entities"""
@@ -115,17 +245,17 @@ class Ghost(SQLModel, table=True):
     __tablename__ = "ghosts"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    game_id: int = Field(foreign_key="games.id")
-    ghost_type: GhostType
-    x: Decimal = Field(decimal_places=2)  # Position x coordinate
-    y: Decimal = Field(decimal_places=2)  # Position y coordinate
-    direction: Direction = Field(default=Direction.UP)
-    mode: GhostMode = Field(default=GhostMode.SCATTER)
-    target_x: Decimal = Field(decimal_places=2, default=Decimal("0"))  # Target position x
-    target_y: Decimal = Field(decimal_places=2, default=Decimal("0"))  # Target position y
-    speed: Decimal = Field(default=Decimal("1.8"), decimal_places=2)
+    game_id: int = Field(foreign_key="games.id", index=True)
+    ghost_type: GhostType = Field(sa_column=Column(IntEnumType(GhostType), nullable=False))
+    x: float  # Position x coordinate (cells)
+    y: float  # Position y coordinate (cells)
+    direction: Direction = Field(default=Direction.UP, sa_column=Column(IntEnumType(Direction), nullable=False))
+    mode: GhostMode = Field(default=GhostMode.SCATTER, sa_column=Column(IntEnumType(GhostMode), nullable=False))
+    target_x: float = Field(default=0.0)  # Target position x
+    target_y: float = Field(default=0.0)  # Target position y
+    speed: float = Field(default=1.8)
     is_in_house: bool = Field(default=True)  # In ghost house at start
-    mode_timer: Decimal = Field(default=Decimal("0"), decimal_places=2)  # Time in current mode
+    mode_timer: float = Field(default=0.0)  # Time in current mode
     last_updated: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationships
@@ -136,6 +266,8 @@ class ScoreEvent(SQLModel, table=True):
     """Individual scoring events during gameplay"""
 
     __tablename__ = "score_events"  # type: ignore[assignment]
+    # Also serves plain game_id lookups, so game_id has no separate index
+    __table_args__ = (Index("ix_score_events_game_created", "game_id", "created_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     game_id: int = Field(foreign_key="games.id")
@@ -152,11 +284,126 @@ class GameState(SQLModel, table=True):
     __tablename__ = "game_states"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    game_id: int = Field(foreign_key="games.id")
-    state_data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))  # Complete game state
+    game_id: int = Field(foreign_key="games.id", index=True)
+    state_data: Dict[str, Any] = Field(default={}, sa_column=Column(OrjsonJSON))  # Complete game state
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class GameSettings(SQLModel, table=True):
+    """Named game settings; the value lives in the typed column selected by value_type"""
+
+    __tablename__ = "game_settings"  # type: ignore[assignment]
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    setting_name: str = Field(max_length=100, unique=True)
+    value_type: SettingValueType = Field(sa_column=Column(IntEnumType(SettingValueType), nullable=False))
+    int_value: Optional[int] = Field(default=None)
+    float_value: Optional[float] = Field(default=None)
+    str_value: Optional[str] = Field(default=None, max_length=500)
+    bool_value: Optional[bool] = Field(default=None)
+    json_value: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(OrjsonJSON))  # Structured values only
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# In-memory tick state (slotted dataclasses, no validation); converted to/from the models at the boundaries
+@dataclass(slots=True)
+class PacmanState:
+    game_id: int
+    x: float
+    y: float
+    id: Optional[int] = None
+    direction: Direction = Direction.NONE
+    next_direction: Direction = Direction.NONE
+    speed: float = 2.0
+    is_powered: bool = False
+    power_time_remaining: float = 0.0
+
+    @classmethod
+    def from_model(cls, pacman: PacMan) -> "PacmanState":
+        return cls(
+            game_id=pacman.game_id,
+            x=pacman.x,
+            y=pacman.y,
+            id=pacman.id,
+            direction=pacman.direction,
+            next_direction=pacman.next_direction,
+            speed=pacman.speed,
+            is_powered=pacman.is_powered,
+            power_time_remaining=pacman.power_time_remaining,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PacmanState":
+        """Rebuild from an ``as_dict()`` payload read back from JSON (enums arrive as labels)"""
+        state = cls(**data)
+        state.direction = Direction(state.direction)
+        state.next_direction = Direction(state.next_direction)
+        return state
+
+    def as_dict(self) -> Dict[str, Any]:
+        return labeled(asdict(self))
+
+    def to_model(self) -> PacMan:
+        return PacMan(
+            id=self.id,
+            game_id=self.game_id,
+            x=self.x,
+            y=self.y,
+            direction_packed=pack_directions(self.direction, self.next_direction),
+            speed=self.speed,
+            is_powered=self.is_powered,
+            power_time_remaining=self.power_time_remaining,
+        )
+
+
+@dataclass(slots=True)
+class GhostState:
+    game_id: int
+    ghost_type: GhostType
+    x: float
+    y: float
+    id: Optional[int] = None
+    direction: Direction = Direction.UP
+    mode: GhostMode = GhostMode.SCATTER
+    target_x: float = 0.0
+    target_y: float = 0.0
+    speed: float = 1.8
+    is_in_house: bool = True
+    mode_timer: float = 0.0
+
+    @classmethod
+    def from_model(cls, ghost: Ghost) -> "GhostState":
+        return cls(
+            game_id=ghost.game_id,
+            ghost_type=ghost.ghost_type,
+            x=ghost.x,
+            y=ghost.y,
+            id=ghost.id,
+            direction=ghost.direction,
+            mode=ghost.mode,
+            target_x=ghost.target_x,
+            target_y=ghost.target_y,
+            speed=ghost.speed,
+            is_in_house=ghost.is_in_house,
+            mode_timer=ghost.mode_timer,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GhostState":
+        """Rebuild from an ``as_dict()`` payload read back from JSON (enums arrive as labels)"""
+        state = cls(**data)
+        state.ghost_type = GhostType(state.ghost_type)
+        state.direction = Direction(state.direction)
+        state.mode = GhostMode(state.mode)
+        return state
+
+    def as_dict(self) -> Dict[str, Any]:
+        return labeled(asdict(self))
+
+    def to_model(self) -> Ghost:
+        return Ghost(**asdict(self))
+
+
 # Non-persistent schemas (for validation, forms, API requests/responses)
 class GameCreate(SQLModel, table=False):
     """Schema for creating a new game"""
@@ -175,6 +422,17 @@ class GameUpdate(SQLModel, table=False):
     current_level: Optional[int] = Field(default=None, ge=1)
 
 
+class GameSession(SQLModel, table=False):
+    """Authoritative live state of a game in progress (cached in Redis, flushed to SQL when it stops ticking)"""
+
+    game_id: int
+    status: GameStatus = Field(default=GameStatus.PLAYING)
+    current_level: int = Field(default=1, ge=1)
+    score: int = Field(default=0, ge=0)
+    lives: int = Field(default=3, ge=0)
+    live_state: Dict[str, Any] = Field(default={})  # PacMan/ghost snapshot, same shape as Game.live_state
+
+
 class PacManMove(SQLModel, table=False):
     """Schema for Pac-Man movement commands"""
 
@@ -185,12 +443,12 @@ class PacManMove(SQLModel, table=False):
 class GhostUpdate(SQLModel, table=False):
     """Schema for ghost state updates"""
 
-    x: Decimal = Field(decimal_places=2)
-    y: Decimal = Field(decimal_places=2)
+    x: float
+    y: float
     direction: Direction
     mode: GhostMode
-    target_x: Optional[Decimal] = Field(default=None, decimal_places=2)
-    target_y: Optional[Decimal] = Field(default=None, decimal_places=2)
+    target_x: Optional[float] = Field(default=None)
+    target_y: Optional[float] = Field(default=None)
 
 
 class MazeCell(SQLModel, table=False):
@@ -208,9 +466,25 @@ class GameStats(SQLModel, table=False):
 
     game_id: int
     player_name: str
-    final_score: Decimal = Field(decimal_places=0)
+    final_score: int  # Game.score is a whole-number Decimal; a plain int keeps it a JSON number
     level_reached: int
     duration_seconds: int
     pellets_eaten: int
     ghosts_eaten: int
     completed_at: datetime
+
+
+class ScoreEventOut(SQLModel, table=False):
+    """Schema for one score event of a game replay (numbers, not the Decimal strings of ScoreEvent)"""
+
+    id: int
+    event_type: str
+    points: int
+    x: float
+    y: float
+    created_at: datetime
+
+
+# List responses are validated and serialized in one call per list rather than one per row
+GameStatsList = TypeAdapter(List[GameStats])
+ScoreEventOutList = TypeAdapter(List[ScoreEventOut])
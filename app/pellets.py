@@ -0,0 +1,71 @@
+"""Pellet bitmaps.
+
+Pellets and power pellets are tracked as one bit per maze cell (``Maze.pellet_bitmap`` and
+``Maze.power_pellet_bitmap``), indexed by ``y * width + x``. Testing or clearing a pellet touches a
+single byte, and counting remaining pellets is a popcount over the whole bitmap.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+from app.models import CellType, Maze
+
+Bitmap = Union[bytes, bytearray]
+
+
+def bitmap_size(width: int, height: int) -> int:
+    return (width * height + 7) // 8
+
+
+def new_bitmap(width: int, height: int) -> bytearray:
+    return bytearray(bitmap_size(width, height))
+
+
+def pellet_set(bitmap: bytearray, x: int, y: int, width: int) -> None:
+    i = y * width + x
+    bitmap[i >> 3] |= 1 << (i & 7)
+
+
+def pellet_clear(bitmap: bytearray, x: int, y: int, width: int) -> None:
+    i = y * width + x
+    bitmap[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+
+def pellet_test(bitmap: Bitmap, x: int, y: int, width: int) -> bool:
+    i = y * width + x
+    return bool(bitmap[i >> 3] & (1 << (i & 7)))
+
+
+def pellet_count(bitmap: Bitmap) -> int:
+    return int.from_bytes(bitmap, "little").bit_count()
+
+
+def bitmap_from_positions(positions: Sequence[Dict[str, int]], width: int, height: int) -> bytearray:
+    """Convert legacy ``[{"x": .., "y": ..}]`` pellet lists into a bitmap"""
+    bitmap = new_bitmap(width, height)
+    for position in positions:
+        pellet_set(bitmap, position["x"], position["y"], width)
+    return bitmap
+
+
+def ensure_bitmaps(maze: Maze) -> None:
+    """Populate the bitmaps of mazes saved before they existed from the pellet position lists"""
+    size = bitmap_size(maze.width, maze.height)
+    if len(maze.pellet_bitmap) != size:
+        maze.pellet_bitmap = bytes(bitmap_from_positions(maze.pellet_positions, maze.width, maze.height))
+    if len(maze.power_pellet_bitmap) != size:
+        maze.power_pellet_bitmap = bytes(bitmap_from_positions(maze.power_pellet_positions, maze.width, maze.height))
+
+
+def remaining_pellets(pellets: Bitmap, power_pellets: Bitmap) -> int:
+    return pellet_count(pellets) + pellet_count(power_pellets)
+
+
+def eat_pellet(pellets: bytearray, power_pellets: bytearray, x: int, y: int, width: int) -> Optional[CellType]:
+    """Clear the pellet at a cell, returning which kind was eaten (``None`` if the cell was empty)"""
+    if pellet_test(pellets, x, y, width):
+        pellet_clear(pellets, x, y, width)
+        return CellType.PELLET
+    if pellet_test(power_pellets, x, y, width):
+        pellet_clear(power_pellets, x, y, width)
+        return CellType.POWER_PELLET
+    return None
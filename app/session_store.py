@@ -0,0 +1,102 @@
+"""Redis-backed store for live game sessions and their ``game:{id}`` update channels."""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Literal, Optional, Protocol
+
+import orjson
+import redis
+import redis.asyncio
+
+from app.models import ORJSON_OPTIONS, GameSession
+
+REDIS_URL = os.environ.get("APP_REDIS_URL", "redis://redis:6379/0")
+# Connections are opened lazily on first command, like the SQL ENGINE
+REDIS_CLIENT = redis.Redis.from_url(REDIS_URL)
+# WebSocket handlers wait on pub/sub messages without blocking the event loop
+ASYNC_REDIS_CLIENT = redis.asyncio.Redis.from_url(REDIS_URL)
+
+SESSION_TTL_SECONDS = 3600
+
+# "type" of a channel message: a full GameSession payload, or the output of app.game_service.state_delta
+MessageType = Literal["state", "delta"]
+STATE_MESSAGE: MessageType = "state"
+DELTA_MESSAGE: MessageType = "delta"
+
+
+class RedisClient(Protocol):
+    """The subset of ``redis.Redis`` the store uses"""
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> Any: ...
+
+    def get(self, name: str) -> Any: ...
+
+    def delete(self, *names: str) -> Any: ...
+
+    def publish(self, channel: str, message: bytes) -> Any: ...
+
+
+class SessionStore:
+    """Live game sessions stored as orjson blobs under ``game:{id}:state``"""
+
+    def __init__(self, client: RedisClient, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def key(game_id: int) -> str:
+        return f"game:{game_id}:state"
+
+    @staticmethod
+    def channel(game_id: int) -> str:
+        return f"game:{game_id}"
+
+    def save(self, game_session: GameSession) -> Dict[str, Any]:
+        """Store the session; returns the dumped payload so callers don't dump it a second time"""
+        payload = game_session.model_dump()
+        self.client.set(
+            self.key(game_session.game_id), orjson.dumps(payload, option=ORJSON_OPTIONS), ex=self.ttl_seconds
+        )
+        return payload
+
+    def load(self, game_id: int) -> Optional[GameSession]:
+        blob = self.client.get(self.key(game_id))
+        if blob is None:
+            return None
+        return GameSession.model_validate(orjson.loads(blob))
+
+    def delete(self, game_id: int) -> None:
+        self.client.delete(self.key(game_id))
+
+    @staticmethod
+    def message(message_type: MessageType, payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps({"type": message_type, **payload}, option=ORJSON_OPTIONS)
+
+    def publish(self, game_id: int, message_type: MessageType, payload: Dict[str, Any]) -> None:
+        """Broadcast a session payload to the game's subscribers"""
+        self.client.publish(self.channel(game_id), self.message(message_type, payload))
+
+
+def get_session_store() -> SessionStore:
+    return SessionStore(REDIS_CLIENT)
+
+
+@asynccontextmanager
+async def subscribe_updates(game_id: int) -> AsyncGenerator[AsyncIterator[bytes], None]:
+    """Subscribe to a game's channel; yields an iterator over its encoded messages (``SessionStore.message``).
+
+    The subscription is active once the context is entered, so state loaded inside it misses no delta.
+    """
+    pubsub = ASYNC_REDIS_CLIENT.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(SessionStore.channel(game_id))
+
+    async def messages() -> AsyncIterator[bytes]:
+        async for message in pubsub.listen():
+            yield message["data"]
+
+    try:
+        yield messages()
+    finally:
+        # Closing the connection drops the subscription; shielded so a cancelled handler still releases it
+        await asyncio.shield(pubsub.aclose())
@@ -0,0 +1,86 @@
+"""Typed game settings.
+
+Each ``GameSettings`` row stores its value in the column matching ``value_type``, so reading a scalar
+setting is an indexed lookup on ``setting_name`` with no JSON parsing.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from sqlmodel import Session, col, select
+
+from app.models import GameSettings, SettingValueType
+
+SettingValue = Union[int, float, str, bool, Dict[str, Any]]
+
+
+def value_type_of(value: SettingValue) -> SettingValueType:
+    # bool is a subclass of int, so it has to be matched first
+    match value:
+        case bool():
+            return SettingValueType.BOOL
+        case int():
+            return SettingValueType.INT
+        case float():
+            return SettingValueType.FLOAT
+        case str():
+            return SettingValueType.STR
+        case dict():
+            return SettingValueType.JSON
+        case _:
+            raise TypeError(f"Unsupported setting value type: {type(value).__name__}")
+
+
+def setting_value(setting: GameSettings) -> Optional[SettingValue]:
+    """Read the value from the column selected by ``value_type``"""
+    match setting.value_type:
+        case SettingValueType.INT:
+            return setting.int_value
+        case SettingValueType.FLOAT:
+            return setting.float_value
+        case SettingValueType.STR:
+            return setting.str_value
+        case SettingValueType.BOOL:
+            return setting.bool_value
+        case SettingValueType.JSON:
+            return setting.json_value
+
+
+def apply_setting_value(setting: GameSettings, value: SettingValue) -> None:
+    """Store a value in its typed column and clear the others"""
+    setting.value_type = value_type_of(value)
+    setting.int_value = None
+    setting.float_value = None
+    setting.str_value = None
+    setting.bool_value = None
+    setting.json_value = None
+    match value:
+        case bool():
+            setting.bool_value = value
+        case int():
+            setting.int_value = value
+        case float():
+            setting.float_value = value
+        case str():
+            setting.str_value = value
+        case dict():
+            setting.json_value = value
+
+
+def get_setting(session: Session, name: str) -> Optional[SettingValue]:
+    setting = session.exec(select(GameSettings).where(col(GameSettings.setting_name) == name)).first()
+    if setting is None:
+        return None
+    return setting_value(setting)
+
+
+def set_setting(session: Session, name: str, value: SettingValue) -> GameSettings:
+    setting = session.exec(select(GameSettings).where(col(GameSettings.setting_name) == name)).first()
+    if setting is None:
+        setting = GameSettings(setting_name=name, value_type=value_type_of(value))
+    apply_setting_value(setting, value)
+    setting.updated_at = datetime.utcnow()
+    session.add(setting)
+    session.commit()
+    session.refresh(setting)
+    return setting
@@ -1,3 +1,4 @@
+import app.api
 from app.database import create_tables
 from nicegui import ui
 
@@ -5,6 +6,7 @@ from nicegui import ui
 def startup() -> None:
     # this function is called before the first request
     create_tables()
+    app.api.create()
 
     @ui.page("/")
     def index():
@@ -0,0 +1,60 @@
+"""Leaderboard and replay queries."""
+
+from typing import List
+
+from sqlmodel import Session, col, desc, func, select
+
+from app.models import Game, GameStats, GameStatsList, ScoreEvent, ScoreEventOut, ScoreEventOutList
+
+PELLET_EVENT_TYPES = ("pellet", "power_pellet")
+GHOST_EVENT_TYPE = "ghost"
+
+
+def leaderboard(session: Session, limit: int = 10) -> List[GameStats]:
+    """Highest-scoring finished games, with pellet/ghost counts aggregated from their score events"""
+    # Pick the top games first (served by ix_games_score_desc), then count events for those games only
+    top_games = (
+        select(  # type: ignore[call-overload]
+            Game.id, Game.player_name, Game.score, Game.current_level, Game.created_at, Game.completed_at
+        )
+        .where(col(Game.completed_at).is_not(None))
+        .order_by(desc(Game.score))
+        .limit(limit)
+        .subquery()
+    )
+    statement = (
+        select(  # type: ignore[call-overload]
+            *top_games.c,
+            func.count(col(ScoreEvent.id)).filter(col(ScoreEvent.event_type).in_(PELLET_EVENT_TYPES)),
+            func.count(col(ScoreEvent.id)).filter(col(ScoreEvent.event_type) == GHOST_EVENT_TYPE),
+        )
+        .outerjoin(ScoreEvent, col(ScoreEvent.game_id) == top_games.c.id)
+        .group_by(*top_games.c)
+        .order_by(desc(top_games.c.score))
+    )
+    rows = [
+        {
+            "game_id": game_id,
+            "player_name": player_name,
+            "final_score": score,
+            "level_reached": level,
+            "duration_seconds": int((completed_at - created_at).total_seconds()),
+            "pellets_eaten": pellets_eaten,
+            "ghosts_eaten": ghosts_eaten,
+            "completed_at": completed_at,
+        }
+        for game_id, player_name, score, level, created_at, completed_at, pellets_eaten, ghosts_eaten in session.exec(
+            statement
+        )
+    ]
+    return GameStatsList.validate_python(rows)
+
+
+def score_event_history(session: Session, game_id: int) -> List[ScoreEventOut]:
+    """Score events of a game in the order they happened, for replays"""
+    statement = (
+        select(ScoreEvent)
+        .where(col(ScoreEvent.game_id) == game_id)
+        .order_by(col(ScoreEvent.created_at), col(ScoreEvent.id))
+    )
+    return ScoreEventOutList.validate_python(session.exec(statement).all())
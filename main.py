@@ -4,6 +4,7 @@ from app.startup import startup
 from nicegui import app, ui
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
@@ -21,6 +22,11 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+# serialize plain return values of API routes with orjson (numpy arrays and non-str dict keys included);
+# routes that build their own Response are unaffected. Must be set before any route is registered
+app.router.default_response_class = ORJSONResponse
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "service": "nicegui-app"}
@@ -1,5 +1,8 @@
 from typing import Generator
 import pytest
+import redis
+from app.database import reset_db
+from app.session_store import REDIS_CLIENT, SessionStore
 from app.startup import startup
 from nicegui.testing import User
 
@@ -10,3 +13,24 @@ pytest_plugins = ["nicegui.testing.plugin"]
 def user(user: User) -> Generator[User, None, None]:
     startup()
     yield user
+
+
+@pytest.fixture()
+def clean_db():
+    """Reset database for each test"""
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def redis_client() -> Generator[redis.Redis, None, None]:
+    """Empty the Redis database at APP_REDIS_URL for each test"""
+    REDIS_CLIENT.flushdb()
+    yield REDIS_CLIENT
+    REDIS_CLIENT.flushdb()
+
+
+@pytest.fixture()
+def session_store(redis_client: redis.Redis) -> SessionStore:
+    return SessionStore(redis_client)
@@ -0,0 +1,79 @@
+"""Tests for the JSON API and the spectator WebSocket."""
+
+import orjson
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.api import MAX_LEADERBOARD_LIMIT, UNKNOWN_GAME_CLOSE_CODE, router
+from app.database import get_session
+from app.game_service import create_game, save_tick
+from app.models import CellType, GameCreate
+from app.session_store import SessionStore
+
+W, E = CellType.WALL, CellType.EMPTY
+CELLS = [[W] * 10] + [[W] + [E] * 8 + [W] for _ in range(8)] + [[W] * 10]
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    api = FastAPI()
+    api.include_router(router)
+    return TestClient(api)
+
+
+@pytest.mark.parametrize("limit", [0, -1, MAX_LEADERBOARD_LIMIT + 1])
+def test_leaderboard_rejects_out_of_range_limit(client, limit):
+    response = client.get("/api/leaderboard", params={"limit": limit})
+
+    assert response.status_code == 422
+
+
+def _subscribers(redis_client, game_id: int) -> int:
+    ((_, count),) = redis_client.pubsub_numsub(SessionStore.channel(game_id))
+    return count
+
+
+def test_spectator_gets_base_state_then_deltas(clean_db, session_store, redis_client, client):
+    with get_session() as session:
+        game_session, pacman, ghosts = create_game(
+            session, GameCreate(maze_width=10, maze_height=10), CELLS, pacman_spawn=(1, 1), ghost_spawn=(4, 4)
+        )
+        state = save_tick(session, session_store, game_session, pacman, ghosts)
+        game_id = game_session.game_id
+
+        with client.websocket_connect(f"/ws/games/{game_id}") as websocket:
+            base_state = orjson.loads(websocket.receive_bytes())
+            # The subscription is open before the base state is sent, so this delta cannot be missed
+            assert _subscribers(redis_client, game_id) == 1
+            game_session.score = 10
+            save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+            delta = orjson.loads(websocket.receive_bytes())
+
+    assert base_state == {"type": "state", **state}
+    assert delta == {"type": "delta", "game_id": game_id, "score": 10}
+    # Closing the socket ends the handler, which unsubscribes from the game's channel
+    assert _subscribers(redis_client, game_id) == 0
+
+
+def test_spectator_base_state_falls_back_to_sql(clean_db, redis_client, client):
+    with get_session() as session:
+        game_session, _, _ = create_game(
+            session, GameCreate(maze_width=10, maze_height=10), CELLS, pacman_spawn=(1, 1), ghost_spawn=(4, 4)
+        )
+
+    with client.websocket_connect(f"/ws/games/{game_session.game_id}") as websocket:
+        base_state = orjson.loads(websocket.receive_bytes())
+
+    assert base_state["type"] == "state"
+    assert base_state["status"] == "playing"
+    assert base_state["live_state"]["pacman"]["x"] == 1.0
+
+
+def test_spectator_of_unknown_game_is_closed(clean_db, redis_client, client):
+    with pytest.raises(WebSocketDisconnect) as disconnect:
+        with client.websocket_connect("/ws/games/999") as websocket:
+            websocket.receive_bytes()
+
+    assert disconnect.value.code == UNKNOWN_GAME_CLOSE_CODE
+    assert _subscribers(redis_client, 999) == 0
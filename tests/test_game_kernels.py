@@ -0,0 +1,117 @@
+"""Logic tests for the per-tick numeric kernels."""
+
+import numpy as np
+
+from app.game_kernels import (
+    DIR_DOWN,
+    DIR_LEFT,
+    DIR_NONE,
+    DIR_UP,
+    apply_ghost_arrays,
+    eat_pellets,
+    ghost_arrays,
+    step_ghosts,
+)
+from app.maze_grid import build_maze, build_neighbor_table, neighbor_table, pack_layout, unpack_layout
+from app.models import CellType, Direction, GhostState, GhostType
+from app.pellets import bitmap_from_positions, pellet_test
+
+W, E = CellType.WALL, CellType.EMPTY
+
+# 5x5 ring corridor around a central wall
+CELLS = [
+    [W, W, W, W, W],
+    [W, E, E, E, W],
+    [W, E, W, E, W],
+    [W, E, E, E, W],
+    [W, W, W, W, W],
+]
+
+
+def _nbrs(cells):
+    return build_neighbor_table(unpack_layout(pack_layout(cells), width=len(cells[0]), height=len(cells)))
+
+
+def test_step_ghosts_moves_towards_target():
+    pos_xy = np.array([[1, 1]], dtype=np.int16)
+    dir_ = np.array([DIR_NONE], dtype=np.int8)
+    targets = np.array([[1, 3]], dtype=np.int16)
+
+    step_ghosts(pos_xy, dir_, targets, _nbrs(CELLS), 5)
+
+    assert pos_xy.tolist() == [[1, 2]]
+    assert dir_.tolist() == [DIR_DOWN]
+
+
+def test_step_ghosts_does_not_reverse():
+    # Heading left at (3, 3): the target is behind, but reversing is only allowed in dead ends
+    pos_xy = np.array([[3, 3]], dtype=np.int16)
+    dir_ = np.array([DIR_LEFT], dtype=np.int8)
+    targets = np.array([[4, 3]], dtype=np.int16)
+
+    step_ghosts(pos_xy, dir_, targets, _nbrs(CELLS), 5)
+
+    assert pos_xy.tolist() == [[3, 2]]
+    assert dir_.tolist() == [DIR_UP]
+
+
+def test_step_ghosts_reverses_in_dead_end():
+    cells = [[W, W, W], [W, E, W], [W, E, W], [W, W, W]]
+    pos_xy = np.array([[1, 1]], dtype=np.int16)
+    dir_ = np.array([DIR_UP], dtype=np.int8)
+    targets = np.array([[1, 0]], dtype=np.int16)
+
+    step_ghosts(pos_xy, dir_, targets, _nbrs(cells), 3)
+
+    assert pos_xy.tolist() == [[1, 2]]
+    assert dir_.tolist() == [DIR_DOWN]
+
+
+def test_step_ghosts_wraps_through_tunnel():
+    cells = [[W] * 10 for _ in range(10)]
+    cells[4] = [E] * 10
+    maze = build_maze(1, cells, pacman_spawn=(5, 4), ghost_spawn=(4, 4), tunnels=[(0, 4, 9, 4)])
+    pos_xy = np.array([[0, 4]], dtype=np.int16)
+    dir_ = np.array([DIR_LEFT], dtype=np.int8)
+    targets = np.array([[8, 4]], dtype=np.int16)
+
+    step_ghosts(pos_xy, dir_, targets, neighbor_table(maze), maze.width)
+
+    assert pos_xy.tolist() == [[9, 4]]
+    assert dir_.tolist() == [DIR_LEFT]
+
+
+def test_eat_pellets_clears_bit():
+    bitmap = bitmap_from_positions([{"x": 3, "y": 1}], 5, 5)
+    view = np.frombuffer(bitmap, dtype=np.uint8)
+    pacman_xy = np.array([3, 1], dtype=np.int16)
+
+    assert eat_pellets(pacman_xy, view, 5) == 1
+    assert not pellet_test(bitmap, 3, 1, 5)
+    assert eat_pellets(pacman_xy, view, 5) == 0
+
+
+def test_ghost_arrays_round_trip():
+    ghosts = [
+        GhostState(
+            game_id=1, ghost_type=GhostType.BLINKY, x=1.0, y=1.0, direction=Direction.LEFT, target_x=1, target_y=3
+        )
+    ]
+
+    maze = build_maze(1, CELLS, pacman_spawn=(3, 3), ghost_spawn=(1, 1))
+
+    pos_xy, dir_, targets = ghost_arrays(ghosts)
+    step_ghosts(pos_xy, dir_, targets, neighbor_table(maze), maze.width)
+    apply_ghost_arrays(ghosts, pos_xy, dir_)
+
+    assert (ghosts[0].x, ghosts[0].y) == (1.0, 2.0)
+    assert ghosts[0].direction == Direction.DOWN
+
+
+def test_ghost_arrays_rounds_to_nearest_cell():
+    ghost = GhostState(game_id=1, ghost_type=GhostType.INKY, x=3.9, y=1.2, target_x=0.6, target_y=2.4)
+
+    pos_xy, _, targets = ghost_arrays([ghost])
+
+    assert pos_xy.tolist() == [[4, 1]]
+    assert targets.tolist() == [[1, 2]]
@@ -0,0 +1,82 @@
+"""Logic tests for game session persistence helpers (no database required)."""
+
+import orjson
+
+from app.game_service import ScoreEventBuffer, restore_live_state, snapshot_live_state, state_delta
+from app.models import Direction, GhostMode, GhostState, GhostType, PacMan, PacmanState
+
+
+def test_live_state_round_trip():
+    pacman = PacmanState(id=1, game_id=7, x=3.5, y=4.0, direction=Direction.LEFT)
+    ghosts = [
+        GhostState(id=10 + i, game_id=7, ghost_type=ghost_type, x=9.0, y=9.0) for i, ghost_type in enumerate(GhostType)
+    ]
+    ghosts[0].mode = GhostMode.FRIGHTENED
+
+    snapshot = snapshot_live_state(pacman, ghosts)
+    restored_pacman, restored_ghosts = restore_live_state(7, snapshot)
+
+    assert "game_id" not in snapshot["pacman"]
+    assert restored_pacman is not None
+    assert restored_pacman.id == 1
+    assert restored_pacman.x == 3.5
+    assert restored_pacman.direction == Direction.LEFT
+    assert [ghost.ghost_type for ghost in restored_ghosts] == list(GhostType)
+    assert restored_ghosts[0].mode == GhostMode.FRIGHTENED
+
+
+def test_live_state_survives_json():
+    ghost = GhostState(id=3, game_id=7, ghost_type=GhostType.CLYDE, x=1.0, y=2.0, mode=GhostMode.EATEN)
+
+    _, (restored,) = restore_live_state(7, orjson.loads(orjson.dumps(snapshot_live_state(None, [ghost]))))
+
+    assert restored == ghost
+    assert restored.mode is GhostMode.EATEN
+
+
+def test_tick_state_model_round_trip():
+    pacman = PacmanState(id=1, game_id=7, x=3.5, y=4.0, next_direction=Direction.UP)
+
+    row = pacman.to_model()
+
+    assert isinstance(row, PacMan)
+    assert row.next_direction == Direction.UP
+    assert PacmanState.from_model(row) == pacman
+
+
+def test_live_state_without_pacman():
+    state = snapshot_live_state(None, [])
+
+    assert state == {"pacman": None, "ghosts": []}
+    assert restore_live_state(7, state) == (None, [])
+
+
+def test_restore_empty_live_state():
+    assert restore_live_state(7, {}) == (None, [])
+
+
+def test_score_event_buffer_fills_up():
+    buffer = ScoreEventBuffer(flush_size=2)
+
+    buffer.add(game_id=1, event_type="pellet", points=10, x=1.0, y=2.0)
+    assert len(buffer) == 1
+    assert not buffer.is_full()
+
+    buffer.add(game_id=1, event_type="ghost", points=200, x=3.0, y=2.0)
+    assert buffer.is_full()
+    assert [event["event_type"] for event in buffer.events] == ["pellet", "ghost"]
+    assert all(event["created_at"] is not None for event in buffer.events)
+
+
+def test_state_delta_keeps_only_changes():
+    ghosts = [GhostState(game_id=7, ghost_type=ghost_type, x=9.0, y=9.0) for ghost_type in GhostType]
+    pacman = PacmanState(game_id=7, x=1.0, y=1.0)
+    previous = {"game_id": 7, "score": 0, "lives": 3, "live_state": snapshot_live_state(pacman, ghosts)}
+    ghosts[2].x = 10.0
+    current = {"game_id": 7, "score": 10, "lives": 3, "live_state": snapshot_live_state(pacman, ghosts)}
+
+    delta = state_delta(previous, current)
+
+    assert delta == {"game_id": 7, "score": 10, "ghosts": {2: current["live_state"]["ghosts"][2]}}
+    assert state_delta(current, current) == {"game_id": 7}
+    assert state_delta(None, current) is current
@@ -0,0 +1,409 @@
+"""Database tests for game session persistence (SQL plus the Redis session store)."""
+
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List
+
+import orjson
+import pytest
+from redis.client import PubSub
+from sqlalchemy import event, text
+from sqlmodel import col, select
+
+from app.database import ENGINE, get_session
+from app.game_service import (
+    ScoreEventBuffer,
+    create_game,
+    get_game,
+    list_games,
+    load_game_session,
+    restore_live_state,
+    save_tick,
+    snapshot_live_state,
+)
+from app.maze_grid import build_maze
+from app.models import (
+    CellType,
+    Direction,
+    Game,
+    GameCreate,
+    GameSession,
+    GameState,
+    GameStatus,
+    Ghost,
+    GhostMode,
+    GhostState,
+    GhostType,
+    PacMan,
+    PacmanState,
+    ScoreEvent,
+)
+from app.session_store import SESSION_TTL_SECONDS, SessionStore
+
+W, E = CellType.WALL, CellType.EMPTY
+
+
+def _create_game() -> int:
+    with get_session() as session:
+        game = Game(status=GameStatus.PLAYING)
+        session.add(game)
+        session.commit()
+        session.refresh(game)
+        assert game.id is not None
+        return game.id
+
+
+def _entities(game_id: int):
+    pacman = PacmanState(game_id=game_id, x=1.0, y=2.0)
+    ghosts = [GhostState(game_id=game_id, ghost_type=ghost_type, x=9.0, y=9.0) for ghost_type in GhostType]
+    return pacman, ghosts
+
+
+def test_save_tick_keeps_playing_session_out_of_sql(clean_db, session_store, redis_client):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    game_session = GameSession(game_id=game_id, score=50)
+
+    with get_session() as session:
+        save_tick(session, session_store, game_session, pacman, ghosts)
+
+    stored = session_store.load(game_id)
+    assert stored is not None
+    assert stored.score == 50
+    assert stored.live_state["pacman"]["x"] == 1.0
+    assert 0 < redis_client.ttl(SessionStore.key(game_id)) <= SESSION_TTL_SECONDS
+    with get_session() as session:
+        game = session.get(Game, game_id)
+        assert game is not None
+        assert game.score == Decimal("0")
+        assert session.exec(select(GameState)).all() == []
+
+
+def test_save_tick_flushes_terminal_session(clean_db, session_store):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    score_events = ScoreEventBuffer()
+    score_events.add(game_id, "pellet", 10, 1.0, 2.0)
+    score_events.add(game_id, "ghost", 200, 3.0, 2.0)
+    game_session = GameSession(game_id=game_id, status=GameStatus.GAME_OVER, score=210, lives=0)
+
+    with get_session() as session:
+        save_tick(session, session_store, game_session, pacman, ghosts, score_events)
+
+    assert len(score_events) == 0
+    with get_session() as session:
+        game = session.get(Game, game_id)
+        assert game is not None
+        assert game.status == GameStatus.GAME_OVER
+        assert game.score == Decimal("210")
+        assert game.lives == 0
+        assert game.completed_at is not None
+        assert len(game.live_state["ghosts"]) == 4
+        (state,) = session.exec(select(GameState)).all()
+        assert state.game_id == game_id
+        assert state.state_data["score"] == 210
+        events = session.exec(select(ScoreEvent).order_by(col(ScoreEvent.id))).all()
+        assert [(event.event_type, event.points) for event in events] == [("pellet", 10), ("ghost", 200)]
+
+
+def test_save_tick_flushes_terminal_status_once(clean_db, session_store):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    game_session = GameSession(game_id=game_id, status=GameStatus.LEVEL_COMPLETE, score=300)
+
+    with get_session() as session:
+        state = save_tick(session, session_store, game_session, pacman, ghosts)
+        # Intermission ticks stay in the store
+        state = save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+        game_session.status = GameStatus.GAME_OVER
+        state = save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+        game = session.get(Game, game_id)
+        assert game is not None
+        completed_at = game.completed_at
+        save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+
+    with get_session() as session:
+        statuses = [state.state_data["status"] for state in session.exec(select(GameState).order_by(col(GameState.id)))]
+        assert statuses == ["level_complete", "game_over"]
+        game = session.get(Game, game_id)
+        assert game is not None
+        assert completed_at is not None
+        assert game.completed_at == completed_at
+
+
+def test_save_tick_flushes_full_score_buffer(clean_db, session_store):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    score_events = ScoreEventBuffer(flush_size=2)
+    game_session = GameSession(game_id=game_id)
+
+    with get_session() as session:
+        score_events.add(game_id, "pellet", 10, 1.0, 2.0)
+        save_tick(session, session_store, game_session, pacman, ghosts, score_events)
+        assert session.exec(select(ScoreEvent)).all() == []
+
+        score_events.add(game_id, "pellet", 10, 2.0, 2.0)
+        save_tick(session, session_store, game_session, pacman, ghosts, score_events)
+
+    with get_session() as session:
+        assert len(session.exec(select(ScoreEvent)).all()) == 2
+
+
+def test_load_game_session_prefers_store(clean_db, session_store):
+    game_id = _create_game()
+    session_store.save(GameSession(game_id=game_id, score=70))
+
+    with get_session() as session:
+        game_session = load_game_session(session, session_store, game_id)
+
+    assert game_session is not None
+    assert game_session.score == 70
+
+
+def test_load_game_session_falls_back_to_sql(clean_db, session_store):
+    game_id = _create_game()
+    with get_session() as session:
+        game = session.get(Game, game_id)
+        assert game is not None
+        game.score = Decimal("120")
+        game.live_state = {"pacman": None, "ghosts": []}
+        session.add(game)
+        session.commit()
+
+    with get_session() as session:
+        game_session = load_game_session(session, session_store, game_id)
+
+    assert game_session is not None
+    assert game_session.score == 120
+    assert game_session.status == GameStatus.PLAYING
+    assert game_session.live_state == {"pacman": None, "ghosts": []}
+    # The SQL state is cached back into the store for the next reconnect
+    assert session_store.load(game_id) == game_session
+
+
+def test_paused_session_survives_store_expiry(clean_db, session_store):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    game_session = GameSession(game_id=game_id, score=500)
+
+    with get_session() as session:
+        state = save_tick(session, session_store, game_session, pacman, ghosts)
+        game_session.status = GameStatus.PAUSED
+        save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+    session_store.delete(game_id)
+
+    with get_session() as session:
+        restored = load_game_session(session, session_store, game_id)
+
+    assert restored is not None
+    assert restored.status == GameStatus.PAUSED
+    assert restored.score == 500
+    assert restored.live_state == snapshot_live_state(pacman, ghosts)
+
+
+def test_load_game_session_without_live_state(clean_db, session_store):
+    game_id = _create_game()
+    with get_session() as session:
+        session.connection().execute(text("UPDATE games SET live_state = NULL WHERE id = :id").bindparams(id=game_id))
+        session.commit()
+
+    with get_session() as session:
+        game_session = load_game_session(session, session_store, game_id)
+
+    assert game_session is not None
+    assert game_session.live_state == {}
+
+
+def test_load_game_session_unknown_game(clean_db, session_store):
+    with get_session() as session:
+        assert load_game_session(session, session_store, 999) is None
+    assert session_store.load(999) is None
+
+
+@contextmanager
+def _count_statements() -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(ENGINE, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", record)
+
+
+def _create_full_games(count: int) -> List[int]:
+    cells = [[W] * 10] + [[W] + [E] * 8 + [W] for _ in range(8)] + [[W] * 10]
+    game_ids = []
+    with get_session() as session:
+        for _ in range(count):
+            game = Game(status=GameStatus.PLAYING)
+            session.add(game)
+            session.flush()
+            assert game.id is not None
+            session.add(build_maze(game.id, cells, pacman_spawn=(1, 1), ghost_spawn=(4, 4)))
+            session.add(PacMan(game_id=game.id, x=1.0, y=1.0))
+            session.add_all(Ghost(game_id=game.id, ghost_type=ghost_type, x=4.0, y=4.0) for ghost_type in GhostType)
+            game_ids.append(game.id)
+        session.commit()
+    return game_ids
+
+
+def test_list_games_loads_relationships_in_fixed_queries(clean_db):
+    _create_full_games(5)
+
+    with get_session() as session:
+        with _count_statements() as statements:
+            games = list_games(session)
+            loaded = [(game.pacman is not None, len(game.ghosts), game.maze is not None) for game in games]
+
+    # games + one selectinload query each for pacman, ghosts and maze, regardless of the game count
+    assert len(statements) == 4
+    assert loaded == [(True, 4, True)] * 5
+
+
+def test_get_game_loads_relationships(clean_db):
+    game_id = _create_full_games(1)[0]
+
+    with get_session() as session:
+        with _count_statements() as statements:
+            game = get_game(session, game_id)
+            assert game is not None
+            ghost_types = sorted(ghost.ghost_type for ghost in game.ghosts)
+            assert game.pacman is not None
+            assert game.maze is not None
+            assert game.maze.width == 10
+
+    assert len(statements) == 4
+    assert ghost_types == list(GhostType)
+    with get_session() as session:
+        assert get_game(session, game_id + 1) is None
+
+
+def test_create_game_returns_persisted_ids(clean_db, session_store):
+    cells = [[W] * 10] + [[W] + [E] * 8 + [W] for _ in range(8)] + [[W] * 10]
+
+    with get_session() as session:
+        game_session, pacman, ghosts = create_game(
+            session,
+            GameCreate(player_name="Ann", maze_width=10, maze_height=10),
+            cells,
+            pacman_spawn=(1, 1),
+            ghost_spawn=(4, 4),
+        )
+
+    game_id = game_session.game_id
+    with get_session() as session:
+        game = get_game(session, game_id)
+        assert game is not None
+        assert game.player_name == "Ann"
+        assert game.status is GameStatus.PLAYING
+        assert game.pacman is not None
+        assert game.pacman.id == pacman.id
+        assert (game.pacman.x, game.pacman.y) == (1.0, 1.0)
+        assert game.maze is not None
+        assert game.maze.game_id == game_id
+        # Ghost ids come back from a multi-row RETURNING and are matched by type
+        assert {ghost.id: ghost.ghost_type for ghost in game.ghosts} == {ghost.id: ghost.ghost_type for ghost in ghosts}
+        assert sorted(ghost.ghost_type for ghost in ghosts) == list(GhostType)
+        # IntEnumType stores the enum code and loads the member back
+        statement = text("SELECT status FROM games WHERE id = :id").bindparams(id=game_id)
+        stored_status = session.connection().execute(statement).scalar_one()
+        assert stored_status == int(GameStatus.PLAYING)
+
+    assert game_session.live_state["pacman"]["id"] == pacman.id
+    assert [ghost["id"] for ghost in game_session.live_state["ghosts"]] == [ghost.id for ghost in ghosts]
+    # The spawn snapshot goes into the games INSERT, so the SQL fallback of a new game has its entities
+    with get_session() as session:
+        fallback = load_game_session(session, session_store, game_id)
+    assert fallback is not None
+    fallback_pacman, fallback_ghosts = restore_live_state(game_id, fallback.live_state)
+    assert fallback_pacman is not None
+    assert (fallback_pacman.game_id, fallback_pacman.x, fallback_pacman.y) == (game_id, 1.0, 1.0)
+    assert [ghost.ghost_type for ghost in fallback_ghosts] == [ghost.ghost_type for ghost in ghosts]
+
+
+def test_create_game_rejects_mismatched_cells(clean_db):
+    cells = [[W] * 10] + [[W] + [E] * 8 + [W] for _ in range(8)] + [[W] * 10]
+
+    with get_session() as session:
+        with pytest.raises(ValueError, match="10x10, expected 30x30"):
+            create_game(
+                session,
+                GameCreate(maze_width=30, maze_height=30),
+                cells,
+                pacman_spawn=(1, 1),
+                ghost_spawn=(4, 4),
+            )
+
+    with get_session() as session:
+        assert session.exec(select(Game)).all() == []
+
+
+def test_level_complete_syncs_entity_rows(clean_db, session_store):
+    cells = [[W] * 10] + [[W] + [E] * 8 + [W] for _ in range(8)] + [[W] * 10]
+    with get_session() as session:
+        game_session, pacman, ghosts = create_game(
+            session, GameCreate(maze_width=10, maze_height=10), cells, pacman_spawn=(1, 1), ghost_spawn=(4, 4)
+        )
+        state = save_tick(session, session_store, game_session, pacman, ghosts)
+
+        pacman.x, pacman.direction = 6.5, Direction.LEFT
+        ghosts[2].x, ghosts[2].mode = 7.0, GhostMode.CHASE
+        # Matched by game and ghost type, so a state without its id still lands on its row
+        ghosts[2].id = None
+        save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+        assert session.exec(select(PacMan)).one().x == 1.0
+
+        game_session.status = GameStatus.LEVEL_COMPLETE
+        save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+
+    with get_session() as session:
+        game = get_game(session, game_session.game_id)
+        assert game is not None
+        assert game.pacman is not None
+        assert (game.pacman.x, game.pacman.direction) == (6.5, Direction.LEFT)
+        rows = {ghost.ghost_type: ghost for ghost in game.ghosts}
+        assert len(game.ghosts) == 4
+        assert (rows[ghosts[2].ghost_type].x, rows[ghosts[2].ghost_type].mode) == (7.0, GhostMode.CHASE)
+        assert rows[ghosts[0].ghost_type].x == 4.0
+
+
+def _published(pubsub: PubSub) -> List[Dict[str, Any]]:
+    """Decode the messages received so far, stopping once none arrives for a short while"""
+    messages = []
+    while (message := pubsub.get_message(timeout=0.5)) is not None:
+        if message["type"] == "message":
+            messages.append(orjson.loads(message["data"]))
+    return messages
+
+
+def test_save_tick_publishes_deltas(clean_db, session_store, redis_client):
+    game_id = _create_game()
+    pacman, ghosts = _entities(game_id)
+    game_session = GameSession(game_id=game_id)
+    pubsub = redis_client.pubsub()
+    pubsub.subscribe(SessionStore.channel(game_id))
+
+    with get_session() as session:
+        state = save_tick(session, session_store, game_session, pacman, ghosts)
+        assert state == session_store.load(game_id).model_dump()
+        state = save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+        game_session.score = 10
+        ghosts[1].x = 8.0
+        save_tick(session, session_store, game_session, pacman, ghosts, previous_state=state)
+
+    full_state, delta = _published(pubsub)
+    pubsub.close()
+    assert full_state["type"] == "state"
+    assert full_state["status"] == "playing"
+    assert len(full_state["live_state"]["ghosts"]) == 4
+    # The unchanged second tick published nothing; the third only what changed
+    assert delta == {
+        "type": "delta",
+        "game_id": game_id,
+        "score": 10,
+        "ghosts": {"1": snapshot_live_state(None, ghosts)["ghosts"][1]},
+    }
@@ -0,0 +1,118 @@
+"""Logic tests for packed maze grid encoding."""
+
+import pytest
+
+from app.maze_grid import (
+    build_maze,
+    cell_at,
+    ensure_neighbor_table,
+    is_wall,
+    maze_grid,
+    neighbor_table,
+    pack_layout,
+    tunnel_array,
+    tunnel_exit,
+    unpack_layout,
+)
+from app.models import CellType, Direction
+from app.pellets import pellet_test
+
+W, E, P, S, H = CellType.WALL, CellType.EMPTY, CellType.PELLET, CellType.POWER_PELLET, CellType.GHOST_HOUSE
+
+CELLS = [
+    [W, W, W, W, W],
+    [W, S, P, P, W],
+    [W, P, H, E, W],
+    [W, W, W, W, W],
+]
+
+
+def test_pack_unpack_round_trip():
+    grid = unpack_layout(pack_layout(CELLS), width=5, height=4)
+
+    assert grid.shape == (4, 5)
+    assert [[cell_at(grid, x, y) for x in range(5)] for y in range(4)] == CELLS
+
+
+def test_is_wall():
+    grid = unpack_layout(pack_layout(CELLS), width=5, height=4)
+
+    assert is_wall(grid, 0, 0)
+    assert not is_wall(grid, 2, 2)
+
+
+def test_pack_rejects_ragged_rows():
+    with pytest.raises(ValueError):
+        pack_layout([[W, W], [W]])
+
+
+def test_unpack_rejects_wrong_size():
+    with pytest.raises(ValueError):
+        unpack_layout(pack_layout(CELLS), width=4, height=4)
+
+
+def test_build_maze():
+    maze = build_maze(1, CELLS, pacman_spawn=(3, 2), ghost_spawn=(2, 2))
+
+    assert (maze.width, maze.height) == (5, 4)
+    assert maze.total_pellets == 4
+    assert maze.remaining_pellets == 4
+    assert pellet_test(maze.power_pellet_bitmap, 1, 1, maze.width)
+    assert not pellet_test(maze.pellet_bitmap, 1, 1, maze.width)
+    assert cell_at(maze_grid(maze), 2, 2) == CellType.GHOST_HOUSE
+
+
+def test_tunnel_exit():
+    maze = build_maze(1, CELLS, pacman_spawn=(3, 2), ghost_spawn=(2, 2), tunnels=[(0, 2, 4, 2), (2, 0, 2, 3)])
+    tunnels = tunnel_array(maze)
+
+    assert tunnels.shape == (2, 4)
+    assert tunnel_exit(tunnels, 0, 2) == (4, 2)
+    assert tunnel_exit(tunnels, 2, 3) == (2, 0)
+    assert tunnel_exit(tunnels, 1, 1) is None
+
+
+def test_maze_without_tunnels():
+    tunnels = tunnel_array(build_maze(1, CELLS, pacman_spawn=(3, 2), ghost_spawn=(2, 2)))
+
+    assert tunnels.shape == (0, 4)
+    assert tunnel_exit(tunnels, 0, 2) is None
+
+
+def test_neighbor_table():
+    nbrs = neighbor_table(build_maze(1, CELLS, pacman_spawn=(3, 2), ghost_spawn=(2, 2)))
+
+    assert nbrs.shape == (20, 4)
+    assert nbrs[1 * 5 + 1].tolist() == [-1, 2 * 5 + 1, -1, 1 * 5 + 2]
+    assert nbrs[2 * 5 + 3, Direction.LEFT] == 2 * 5 + 2
+    assert nbrs[0].tolist() == [-1, -1, -1, -1]
+
+
+def test_neighbor_table_wraps_through_tunnels():
+    cells = [[W] * 10 for _ in range(10)]
+    cells[4] = [E] * 10
+    nbrs = neighbor_table(build_maze(1, cells, pacman_spawn=(5, 4), ghost_spawn=(4, 4), tunnels=[(0, 4, 9, 4)]))
+
+    assert nbrs[40, Direction.LEFT] == 49
+    assert nbrs[49, Direction.RIGHT] == 40
+    assert nbrs[40, Direction.RIGHT] == 41
+
+
+def test_ensure_neighbor_table_backfills_legacy_rows():
+    cells = [[W] * 10 for _ in range(10)]
+    cells[4] = [E] * 10
+    maze = build_maze(1, cells, pacman_spawn=(5, 4), ghost_spawn=(4, 4), tunnels=[(0, 4, 9, 4)])
+    expected = maze.neighbor_table
+    maze.neighbor_table = b""
+
+    with pytest.raises(ValueError):
+        neighbor_table(maze)
+    ensure_neighbor_table(maze)
+
+    assert maze.neighbor_table == expected
+    assert neighbor_table(maze)[40, Direction.LEFT] == 49
+
+
+def test_tunnel_end_must_be_on_edge():
+    with pytest.raises(ValueError):
+        build_maze(1, CELLS, pacman_spawn=(3, 2), ghost_spawn=(2, 2), tunnels=[(1, 1, 4, 2)])
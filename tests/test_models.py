@@ -0,0 +1,104 @@
+"""Checks on model registration (no database required)."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+from sqlalchemy.dialects import sqlite
+from sqlmodel import SQLModel
+
+from app import models
+
+
+def test_each_table_registered_once():
+    tables = [
+        getattr(obj, "__table__")
+        for obj in vars(models).values()
+        if isinstance(obj, type) and issubclass(obj, SQLModel) and hasattr(obj, "__table__")
+    ]
+    table_names = [table.name for table in tables]
+
+    assert len(table_names) == len(set(table_names))
+    for table in tables:
+        assert SQLModel.metadata.tables[table.name] is table
+    assert SQLModel.metadata.tables["games"] is getattr(models.Game, "__table__")
+
+
+def test_int_enums_parse_labels_and_codes():
+    assert models.Direction("left") is models.Direction.LEFT
+    assert models.Direction(2) is models.Direction.LEFT
+    assert models.GameStatus("game_over").label == "game_over"
+    ghost = models.Ghost.model_validate({"game_id": 1, "ghost_type": "inky", "x": 0, "y": 0, "direction": "up"})
+    assert (ghost.ghost_type, ghost.direction) == (models.GhostType.INKY, models.Direction.UP)
+
+
+def test_int_enum_column_round_trip():
+    column_type = models.IntEnumType(models.GhostMode)
+    dialect = sqlite.dialect()
+
+    assert column_type.process_bind_param(models.GhostMode.FRIGHTENED, dialect) == 2
+    assert column_type.process_bind_param("eaten", dialect) == 3
+    assert column_type.process_result_value(2, dialect) is models.GhostMode.FRIGHTENED
+    assert column_type.process_bind_param(None, dialect) is None
+
+
+def test_int_enums_serialize_as_labels():
+    game_session = models.GameSession(game_id=1, status=models.GameStatus.GAME_OVER)
+    ghost = models.GhostState(game_id=1, ghost_type=models.GhostType.PINKY, x=0.0, y=0.0)
+
+    assert game_session.model_dump()["status"] == "game_over"
+    assert models.GameSession.model_validate(game_session.model_dump()) == game_session
+    assert ghost.as_dict()["ghost_type"] == "pinky"
+    assert models.GhostState.from_dict(ghost.as_dict()) == ghost
+
+
+def test_score_event_list_serializes_in_one_call():
+    events = [
+        models.ScoreEvent(
+            id=i,
+            game_id=1,
+            event_type="pellet",
+            points=Decimal("10"),
+            x=Decimal("1.50"),
+            y=Decimal("2"),
+            created_at=datetime(2026, 1, 1),
+        )
+        for i in (1, 2)
+    ]
+
+    payload = orjson.loads(models.ScoreEventOutList.dump_json(models.ScoreEventOutList.validate_python(events)))
+
+    assert [event["id"] for event in payload] == [1, 2]
+    assert (payload[0]["points"], payload[0]["x"], payload[0]["y"]) == (10, 1.5, 2.0)
+    assert "game_id" not in payload[0]
+
+
+def test_pacman_directions_share_one_column():
+    pacman = models.PacMan(game_id=1, x=0, y=0)
+    assert (pacman.direction, pacman.next_direction) == (models.Direction.NONE, models.Direction.NONE)
+
+    pacman.direction = models.Direction.LEFT
+    pacman.next_direction = models.Direction.UP
+
+    assert pacman.direction_packed == models.pack_directions(models.Direction.LEFT, models.Direction.UP)
+    assert (pacman.direction, pacman.next_direction) == (models.Direction.LEFT, models.Direction.UP)
+    assert "direction" not in pacman.model_dump()
+
+
+def test_game_stats_list_dumps_numbers():
+    stats = models.GameStatsList.validate_python(
+        [
+            {
+                "game_id": 1,
+                "player_name": "Ann",
+                "final_score": Decimal("3200"),
+                "level_reached": 2,
+                "duration_seconds": 90,
+                "pellets_eaten": 150,
+                "ghosts_eaten": 3,
+                "completed_at": datetime(2026, 1, 1),
+            }
+        ]
+    )
+
+    assert orjson.loads(models.GameStatsList.dump_json(stats))[0]["final_score"] == 3200
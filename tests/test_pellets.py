@@ -0,0 +1,67 @@
+"""Logic tests for pellet bitmaps."""
+
+from app.models import CellType, Maze
+from app.pellets import (
+    bitmap_from_positions,
+    bitmap_size,
+    eat_pellet,
+    ensure_bitmaps,
+    new_bitmap,
+    pellet_clear,
+    pellet_count,
+    pellet_set,
+    pellet_test,
+    remaining_pellets,
+)
+
+
+def test_bitmap_size_rounds_up():
+    assert bitmap_size(19, 21) == 50
+    assert bitmap_size(4, 2) == 1
+
+
+def test_set_test_clear():
+    bitmap = new_bitmap(19, 21)
+
+    pellet_set(bitmap, 18, 20, 19)
+    pellet_set(bitmap, 0, 0, 19)
+
+    assert pellet_test(bitmap, 18, 20, 19)
+    assert pellet_test(bitmap, 0, 0, 19)
+    assert not pellet_test(bitmap, 1, 0, 19)
+    assert pellet_count(bitmap) == 2
+
+    pellet_clear(bitmap, 18, 20, 19)
+
+    assert not pellet_test(bitmap, 18, 20, 19)
+    assert pellet_count(bitmap) == 1
+
+
+def test_eat_pellet():
+    pellets = bitmap_from_positions([{"x": 1, "y": 1}], 10, 10)
+    power_pellets = bitmap_from_positions([{"x": 2, "y": 1}], 10, 10)
+
+    assert eat_pellet(pellets, power_pellets, 1, 1, 10) == CellType.PELLET
+    assert eat_pellet(pellets, power_pellets, 1, 1, 10) is None
+    assert eat_pellet(pellets, power_pellets, 2, 1, 10) == CellType.POWER_PELLET
+    assert remaining_pellets(pellets, power_pellets) == 0
+
+
+def test_ensure_bitmaps_migrates_position_lists():
+    maze = Maze(
+        game_id=1,
+        width=10,
+        height=10,
+        pellet_positions=[{"x": 1, "y": 2}, {"x": 3, "y": 4}],
+        power_pellet_positions=[{"x": 9, "y": 9}],
+        ghost_spawn_x=5,
+        ghost_spawn_y=5,
+        pacman_spawn_x=1,
+        pacman_spawn_y=1,
+    )
+
+    ensure_bitmaps(maze)
+
+    assert pellet_test(maze.pellet_bitmap, 3, 4, 10)
+    assert pellet_test(maze.power_pellet_bitmap, 9, 9, 10)
+    assert remaining_pellets(maze.pellet_bitmap, maze.power_pellet_bitmap) == 3
@@ -0,0 +1,37 @@
+"""Logic tests for typed game settings (no database required)."""
+
+import pytest
+
+from app.models import GameSettings, SettingValueType
+from app.settings_service import apply_setting_value, setting_value, value_type_of
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (True, SettingValueType.BOOL),
+        (3, SettingValueType.INT),
+        (0.5, SettingValueType.FLOAT),
+        ("classic", SettingValueType.STR),
+        ({"up": "w"}, SettingValueType.JSON),
+    ],
+)
+def test_value_type_of(value, expected):
+    assert value_type_of(value) == expected
+
+
+def test_value_type_of_rejects_unsupported():
+    with pytest.raises(TypeError):
+        value_type_of([1, 2])  # type: ignore[arg-type]
+
+
+def test_apply_setting_value_switches_column():
+    setting = GameSettings(setting_name="starting_lives", value_type=SettingValueType.INT)
+
+    apply_setting_value(setting, 3)
+    assert setting_value(setting) == 3
+
+    apply_setting_value(setting, False)
+    assert setting.value_type == SettingValueType.BOOL
+    assert setting.int_value is None
+    assert not setting_value(setting)
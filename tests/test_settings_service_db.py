@@ -0,0 +1,36 @@
+"""Database tests for typed game settings."""
+
+from sqlmodel import select
+
+from app.database import get_session
+from app.models import GameSettings, SettingValueType
+from app.settings_service import get_setting, set_setting
+
+
+def test_set_and_get_each_value_type(clean_db):
+    values = {"starting_lives": 3, "ghost_speed": 1.8, "maze": "classic", "sound": False, "keys": {"up": "w"}}
+
+    with get_session() as session:
+        for name, value in values.items():
+            set_setting(session, name, value)
+
+    with get_session() as session:
+        assert {name: get_setting(session, name) for name in values} == values
+
+
+def test_set_setting_updates_row_in_place(clean_db):
+    with get_session() as session:
+        first = set_setting(session, "starting_lives", 3)
+        second = set_setting(session, "starting_lives", True)
+
+    assert second.id == first.id
+    with get_session() as session:
+        (setting,) = session.exec(select(GameSettings)).all()
+        assert setting.value_type == SettingValueType.BOOL
+        assert setting.int_value is None
+        assert get_setting(session, "starting_lives") is True
+
+
+def test_get_missing_setting(clean_db):
+    with get_session() as session:
+        assert get_setting(session, "missing") is None
@@ -0,0 +1,65 @@
+"""Database tests for leaderboard and replay queries."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.database import get_session
+from app.models import Game, GameStatus, ScoreEvent
+from app.stats_service import leaderboard, score_event_history
+
+
+def _finished_game(session, score: int, events=(), completed: bool = True) -> int:
+    started = datetime(2026, 1, 1, 12, 0, 0)
+    game = Game(
+        player_name=f"player-{score}",
+        status=GameStatus.GAME_OVER if completed else GameStatus.PLAYING,
+        score=Decimal(score),
+        created_at=started,
+        completed_at=started + timedelta(seconds=90) if completed else None,
+    )
+    session.add(game)
+    session.flush()
+    assert game.id is not None
+    session.add_all(
+        ScoreEvent(game_id=game.id, event_type=event_type, points=Decimal("10"), x=Decimal("1"), y=Decimal("1"))
+        for event_type in events
+    )
+    return game.id
+
+
+def test_leaderboard_ranks_top_finished_games(clean_db):
+    with get_session() as session:
+        best = _finished_game(session, 900, events=["pellet", "power_pellet", "ghost", "pellet"])
+        second = _finished_game(session, 500, events=["ghost", "ghost"])
+        _finished_game(session, 100, events=["pellet"])
+        _finished_game(session, 5000, events=["pellet"], completed=False)
+        session.commit()
+
+    with get_session() as session:
+        stats = leaderboard(session, limit=2)
+
+    assert [(row.game_id, row.final_score) for row in stats] == [(best, 900), (second, 500)]
+    assert [(row.pellets_eaten, row.ghosts_eaten) for row in stats] == [(3, 1), (0, 2)]
+    assert stats[0].duration_seconds == 90
+
+
+def test_leaderboard_counts_games_without_events(clean_db):
+    with get_session() as session:
+        game_id = _finished_game(session, 300)
+        session.commit()
+
+    with get_session() as session:
+        (row,) = leaderboard(session)
+
+    assert (row.game_id, row.pellets_eaten, row.ghosts_eaten) == (game_id, 0, 0)
+
+
+def test_score_event_history_in_order(clean_db):
+    with get_session() as session:
+        game_id = _finished_game(session, 30, events=["pellet", "ghost", "pellet"])
+        session.commit()
+
+    with get_session() as session:
+        events = score_event_history(session, game_id)
+
+    assert [event.event_type for event in events] == ["pellet", "ghost", "pellet"]